@@ -0,0 +1,48 @@
+"""
+WhitePager - Asset Loading Benchmark
+Builds the asset pack, then times AssetPreloader.load_blocking() from the
+loose files and from the pack, each in a fresh interpreter so nothing is
+already decoded (the OS file cache stays warm). Prints the pack size and the
+median of several cold loads.
+
+Run from the repo root: python -m benchmarks.assets [runs]
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from src.core.pack import build_pack
+from src.core.preload import ASSET_MANIFEST, ASSET_PACK_PATH
+
+# Child process: import, load once, print the load time in ms
+_CHILD = """
+import sys, time
+from src.core.preload import AssetPreloader
+start = time.perf_counter()
+preloader = AssetPreloader(pack_path=sys.argv[1] or None)
+preloader.load_blocking()
+print((time.perf_counter() - start) * 1000.0)
+"""
+
+
+def _cold_load(pack_path: str) -> float:
+    out = subprocess.run([sys.executable, "-c", _CHILD, pack_path], capture_output=True, text=True, check=True,
+                         env={**os.environ, "PYGAME_HIDE_SUPPORT_PROMPT": "1"})
+    return float(out.stdout.split()[-1])
+
+
+def main(runs: int = 5):
+    size = build_pack(ASSET_MANIFEST, ASSET_PACK_PATH)
+    source = sum(os.path.getsize(entry["path"]) for entry in ASSET_MANIFEST)
+    print(f"pack: {size / 1024:.0f} KiB for {len(ASSET_MANIFEST)} assets ({source / 1024:.0f} KiB of source files)")
+    for label, pack_path in (("loose files", ""), ("pack", ASSET_PACK_PATH)):
+        times = [_cold_load(pack_path) for _ in range(runs)]
+        print(f"{label:>12}: {statistics.median(times):6.1f} ms cold load (median of {runs})")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
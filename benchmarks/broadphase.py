@@ -0,0 +1,65 @@
+"""
+WhitePager - Broadphase Benchmark
+Compares per-bullet pygame.sprite.spritecollide against the SweepIndex.
+Entities are spread along the strip at a constant density, as they are in play.
+
+Run from the repo root: python -m benchmarks.broadphase
+"""
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from src.constants import SURFACE_Y
+from src.core.broadphase import SweepIndex
+
+SPACING = 60  # Average px of strip per enemy
+
+
+class _Box(pygame.sprite.Sprite):
+    def __init__(self, x: float, y: float, size: int):
+        super().__init__()
+        self.rect = pygame.Rect(0, 0, size, size)
+        self.rect.center = (int(x), int(y))
+
+
+def _scenario(n_enemies: int, n_bullets: int, rng: random.Random):
+    width = n_enemies * SPACING
+    enemies = pygame.sprite.Group(
+        _Box(rng.uniform(0, width), SURFACE_Y - 20, 40) for _ in range(n_enemies))
+    bullets = [_Box(rng.uniform(0, width), SURFACE_Y - rng.uniform(0, 60), 12) for _ in range(n_bullets)]
+    return enemies, bullets
+
+
+def _time(fn, repeats: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000.0
+
+
+def main():
+    rng = random.Random(0)
+    print(f"{'enemies':>8} {'bullets':>8} {'brute ms':>10} {'sweep ms':>10} {'hits':>6}")
+    for n_enemies, n_bullets in ((250, 125), (500, 250), (1000, 500), (2000, 1000)):
+        enemies, bullets = _scenario(n_enemies, n_bullets, rng)
+        index = SweepIndex()
+
+        def brute():
+            return sum(len(pygame.sprite.spritecollide(b, enemies, False)) for b in bullets)
+
+        def sweep():
+            index.rebuild(enemies)
+            return sum(len(index.query(b.rect)) for b in bullets)
+
+        assert brute() == sweep()
+        print(f"{n_enemies:>8} {n_bullets:>8} {_time(brute):>10.2f} {_time(sweep):>10.2f} {sweep():>6}")
+
+
+if __name__ == "__main__":
+    main()
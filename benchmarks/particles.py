@@ -0,0 +1,74 @@
+"""
+WhitePager - Particle Rendering Benchmark
+The old per-particle fill() loop against ParticleSystem.draw (one fblits() of
+a prebaked stamp per (color, size) bucket), with and without the additive
+glow pass, in ms per frame. Particles are spread over a strip three screens
+wide, so about a third of them survive culling.
+
+Run from the repo root: python -m benchmarks.particles
+"""
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+from src.constants import SCREEN_WIDTH, SCREEN_HEIGHT, SIM_DT, NEON_GLOW, GHOST_BLUE, SURFACE_COLOR
+from src.core.vfx import ParticleSystem
+
+FRAMES = 60
+
+
+def _per_frame(fn) -> float:
+    fn()  # Warm-up (stamps are baked on first use)
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        fn()
+    return (time.perf_counter() - start) * 1000.0 / FRAMES
+
+
+def _fill_draw(vfx: ParticleSystem, surface: pygame.Surface, offset_x: int = 0, offset_y: int = 0,
+               scale: float = 1.0):
+    """The previous ParticleSystem.draw: one fill() per visible particle."""
+    n = vfx.count
+    sizes = np.maximum(1, (vfx.size[:n] * (vfx.lifetime[:n] / vfx.max_lifetime[:n]) * scale).astype(np.int32))
+    xs = ((vfx.pos[:n, 0].astype(np.int32) + offset_x) * scale).astype(np.int32)
+    ys = ((vfx.pos[:n, 1].astype(np.int32) + offset_y) * scale).astype(np.int32)
+    w, h = surface.get_size()
+    visible = np.flatnonzero((xs + sizes > 0) & (xs < w) & (ys + sizes > 0) & (ys < h))
+    fill = surface.fill
+    for x, y, s, c in zip(xs[visible].tolist(), ys[visible].tolist(),
+                          sizes[visible].tolist(), vfx.color[visible].tolist()):
+        fill(c, (x, y, s, s))
+
+
+def _particles(n: int) -> ParticleSystem:
+    vfx = ParticleSystem(seed=0)
+    rng = np.random.default_rng(0)
+    colors = [NEON_GLOW, GHOST_BLUE, SURFACE_COLOR]
+    for i in range(n // 30):
+        vfx.emit_explosion(rng.uniform(-SCREEN_WIDTH, SCREEN_WIDTH * 2), rng.uniform(0, SCREEN_HEIGHT),
+                           colors[i % len(colors)], 30)
+    # Age them a little so sizes spread out as in play
+    vfx.update(SIM_DT * 6)
+    return vfx
+
+
+def main():
+    surface = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    print(f"{'particles':>9} {'drawn':>6} {'fill':>7} {'stamps':>7} {'+glow':>7}  ms/frame")
+    for n in (1000, 10000, 50000):
+        vfx = _particles(n)
+        fill_ms = _per_frame(lambda: _fill_draw(vfx, surface))
+        vfx.glow = False
+        drawn = vfx.draw(surface)
+        stamp_ms = _per_frame(lambda: vfx.draw(surface))
+        vfx.glow = True
+        glow_ms = _per_frame(lambda: vfx.draw(surface))
+        print(f"{vfx.count:>9} {drawn:>6} {fill_ms:>7.2f} {stamp_ms:>7.2f} {glow_ms:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+WhitePager - Render Pipeline Benchmark
+Serial vs pipelined rendering of the same seeded bot session: frames per
+second, and frame latency from frame start to flip.
+
+Run from the repo root: python -m benchmarks.pipeline [frames]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from src.main import GameEngine
+
+SEED = 1234
+
+
+def _run(frames: int, render_size, pipelined: bool) -> dict:
+    engine = GameEngine(headless=True, seed=SEED, render_size=render_size, pipelined=pipelined)
+    engine.load_assets_blocking()
+    start = time.perf_counter()
+    stats = engine.run_headless(frames)
+    wall = time.perf_counter() - start
+    latency = sorted(engine.frame_latency_ms)
+    result = {
+        "fps": stats["frames"] / wall,
+        "latency": sum(latency) / len(latency),
+        "latency_p95": latency[int(len(latency) * 0.95)],
+    }
+    if engine.pipeline is not None:
+        result.update(engine.pipeline.stats())
+        engine.shutdown()
+    return result
+
+
+def main(frames: int = 1200):
+    print(f"{os.cpu_count()} CPUs, {frames} frames per run")
+    print(f"{'render':>10} {'mode':>10} {'fps':>7} {'latency':>8} {'p95':>7} {'worker':>7} {'wait':>6}  ms")
+    for size in ((1280, 720), (960, 540), (640, 360)):
+        for pipelined in (False, True):
+            r = _run(frames, size, pipelined)
+            extra = f"{r['worker_ms']:>7.2f} {r['wait_ms']:>6.2f}" if pipelined else f"{'-':>7} {'-':>6}"
+            print(f"{f'{size[0]}x{size[1]}':>10} {'pipelined' if pipelined else 'serial':>10} "
+                  f"{r['fps']:>7.0f} {r['latency']:>8.2f} {r['latency_p95']:>7.2f} {extra}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1200)
@@ -0,0 +1,85 @@
+"""
+WhitePager - Post-Processing Benchmark
+PostProcessor.apply_effects with the blend backend against the numpy backend,
+inline and split into row bands on a thread pool, in ms per frame.
+
+Run from the repo root: python -m benchmarks.post_processing
+"""
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+from src.constants import SCREEN_WIDTH, SCREEN_HEIGHT, SIM_DT, NEON_GLOW, GHOST_BLUE, SURFACE_COLOR
+from src.core import post_kernels
+from src.core.post_processing import PostProcessor
+
+FRAMES = 60
+
+
+def _scene(size) -> pygame.Surface:
+    """A dark frame with a bright divide line, glowing shapes and sprites."""
+    rng = random.Random(0)
+    w, h = size
+    surf = pygame.Surface(size).convert()
+    surf.fill((10, 15, 30))
+    pygame.draw.line(surf, NEON_GLOW, (0, h // 2), (w, h // 2), 4)
+    for _ in range(60):
+        color = rng.choice([NEON_GLOW, GHOST_BLUE, SURFACE_COLOR, (255, 255, 255)])
+        pygame.draw.rect(surf, color, (rng.randrange(w), rng.randrange(h), w // 32, w // 32))
+    for _ in range(6):
+        pygame.draw.ellipse(surf, (80, 20, 100), (rng.randrange(w), rng.randrange(h), w // 10, h // 8))
+    return surf
+
+
+def _per_frame(post: PostProcessor, scene: pygame.Surface) -> float:
+    post.apply_effects(scene, SIM_DT)  # Warm-up
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        post.apply_effects(scene, SIM_DT)
+    return (time.perf_counter() - start) * 1000.0 / FRAMES
+
+
+def _aberration_error(size, scene: pygame.Surface) -> int:
+    """Largest per-channel difference between the numpy and blend aberration passes."""
+    out = pygame.Surface(size).convert()
+    post_kernels.chromatic_aberration(scene, out, 3)
+    return int(np.abs(pygame.surfarray.array3d(out).astype(int) - _blend_aberration(size, scene).astype(int)).max())
+
+
+def _blend_aberration(size, scene: pygame.Surface) -> np.ndarray:
+    final = scene.copy()
+    r_shift = pygame.Surface(size).convert()
+    r_shift.blit(scene, (3, 0))
+    r_shift.fill((255, 100, 100), special_flags=pygame.BLEND_RGB_MULT)
+    b_shift = pygame.Surface(size).convert()
+    b_shift.blit(scene, (-3, 0))
+    b_shift.fill((100, 100, 255), special_flags=pygame.BLEND_RGB_MULT)
+    final.fill((180, 200, 180), special_flags=pygame.BLEND_RGB_MULT)
+    final.blit(r_shift, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
+    final.blit(b_shift, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
+    return pygame.surfarray.array3d(final)
+
+
+def main():
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    threads = max(2, os.cpu_count() or 1)
+    print(f"{os.cpu_count()} CPUs; numpy/threaded uses {threads} row bands")
+    print(f"{'render':>10} {'blend':>7} {'numpy':>7} {'threaded':>9} {'aberr. max err':>15}  ms/frame")
+    for size in ((1280, 720), (960, 540), (640, 360)):
+        scene = _scene(size)
+        blend = _per_frame(PostProcessor(*size, backend="blend"), scene)
+        numpy_ms = _per_frame(PostProcessor(*size, backend="numpy"), scene)
+        threaded = PostProcessor(*size, backend="numpy", threads=threads)
+        threaded_ms = _per_frame(threaded, scene)
+        threaded.set_backend("numpy", 1)
+        print(f"{f'{size[0]}x{size[1]}':>10} {blend:>7.2f} {numpy_ms:>7.2f} {threaded_ms:>9.2f} "
+              f"{_aberration_error(size, scene):>15}")
+
+
+if __name__ == "__main__":
+    main()
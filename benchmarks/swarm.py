@@ -0,0 +1,62 @@
+"""
+WhitePager - Swarm Benchmark
+Per-sprite BaseEnemy/Echo update() against the vectorized EnemySwarm/EchoSwarm
+step, in ms per 60 Hz tick (budget: 16.7 ms for the whole frame).
+
+Run from the repo root: python -m benchmarks.swarm
+"""
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from src.constants import SURFACE_Y, SIM_DT
+from src.core.swarm import EnemySwarm, EchoSwarm
+from src.entities.enemies import BaseEnemy, Echo
+
+TICKS = 300
+SPACING = 60  # Average px of strip per entity
+
+
+def _per_tick(fn) -> float:
+    start = time.perf_counter()
+    for _ in range(TICKS):
+        fn()
+    return (time.perf_counter() - start) * 1000.0 / TICKS
+
+
+def _grunts(n: int, swarm):
+    rng = random.Random(0)
+    return pygame.sprite.Group(
+        BaseEnemy(rng.uniform(0, n * SPACING), SURFACE_Y - 50, spawn_direction=rng.choice(["left", "right"]),
+                  rng=rng, swarm=swarm) for _ in range(n))
+
+
+def _echoes(n: int, swarm):
+    rng = random.Random(0)
+    return pygame.sprite.Group(
+        Echo(rng.uniform(-1500, 1500), SURFACE_Y + 60, "grunt", rng=rng, swarm=swarm) for _ in range(n))
+
+
+def main():
+    print(f"{'entities':>8} {'grunts py':>10} {'grunts np':>10} {'echoes py':>10} {'echoes np':>10}  ms/tick")
+    for n in (500, 1000, 5000, 10000):
+        grunts = _grunts(n, None)
+        grunt_py = _per_tick(lambda: grunts.update(SIM_DT))
+        enemy_swarm = EnemySwarm(seed=0)
+        _grunts(n, enemy_swarm)
+        grunt_np = _per_tick(lambda: enemy_swarm.step(SIM_DT))
+
+        echoes = _echoes(n, None)
+        echo_py = _per_tick(lambda: [echo.update(SIM_DT, 0.0, SURFACE_Y + 60) for echo in echoes])
+        echo_swarm = EchoSwarm(seed=0)
+        _echoes(n, echo_swarm)
+        echo_np = _per_tick(lambda: echo_swarm.step(SIM_DT, 0.0))
+        print(f"{n:>8} {grunt_py:>10.2f} {grunt_np:>10.2f} {echo_py:>10.2f} {echo_np:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
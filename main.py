@@ -1,9 +1,77 @@
+import argparse
 import asyncio
 from src.main import GameEngine
+from src.constants import POST_BACKEND, POST_THREADS
+from src.core.post_processing import POST_BACKENDS
+from src.core.replay import Replay, ReplayInput
+
+def parse_size(text: str):
+    w, h = text.lower().split("x")
+    return int(w), int(h)
+
+def parse_args():
+    parser = argparse.ArgumentParser(prog="main.py", description="Souls of the Beneath")
+    parser.add_argument("--headless", action="store_true",
+                        help="run a bot-driven simulation with dummy video/audio as fast as possible")
+    parser.add_argument("--frames", type=int, default=3600, help="frames to simulate in headless mode")
+    parser.add_argument("--seed", type=int, default=None, help="seed for every simulation RNG")
+    parser.add_argument("--dt", type=float, default=1.0 / 60.0, help="fixed timestep in headless mode")
+    parser.add_argument("--no-draw", action="store_true", help="skip rendering in headless mode")
+    parser.add_argument("--render-size", type=parse_size, default=None,
+                        help="internal render resolution, e.g. 640x360 or 960x540")
+    parser.add_argument("--smooth-upscale", action="store_true", help="smooth instead of sharp upscale")
+    parser.add_argument("--pipelined", action="store_true",
+                        help="post-process each frame on a worker thread while the next one simulates")
+    parser.add_argument("--post-backend", choices=POST_BACKENDS, default=POST_BACKEND,
+                        help="post-processing implementation for aberration and bloom")
+    parser.add_argument("--post-threads", type=int, default=POST_THREADS,
+                        help="threads for the numpy post-processing kernels (1 = inline)")
+    parser.add_argument("--profile", action="store_true", help="start with the frame profiler on (F3 toggles)")
+    parser.add_argument("--trace", default=None, help="headless mode: write a Chrome trace of the run here")
+    parser.add_argument("--record", default=None, help="record the session's input to this replay file")
+    parser.add_argument("--replay", default=None, help="play a recorded session back at uncapped speed")
+    # parse_known_args: pygbag may pass its own arguments
+    return parser.parse_known_args()[0]
+
+def log_quality_changes(engine: GameEngine):
+    """Prints every quality tier change the engine's governor makes."""
+    quality = engine.quality
+    quality.add_listener(lambda old, new, percentile_ms: print(
+        f"Quality: {old.name} -> {new.name} (p{int(quality.percentile * 100)} frame {percentile_ms:.1f} ms)"))
 
 async def main():
-    engine = GameEngine()
-    await engine.run()
+    args = parse_args()
+    render = {"smooth_upscale": args.smooth_upscale, "pipelined": args.pipelined,
+              "post_backend": args.post_backend, "post_threads": args.post_threads}
+    if args.render_size:
+        render["render_size"] = args.render_size
+    if args.replay:
+        replay = Replay.load(args.replay)
+        engine = GameEngine(headless=args.headless, seed=replay.seed, input_source=ReplayInput(replay), **render)
+        engine.profiler.enabled = args.profile or args.trace is not None
+        if args.profile:
+            log_quality_changes(engine)
+        engine.run_replay(replay, draw=not args.no_draw)
+    elif args.headless:
+        engine = GameEngine(headless=True, seed=args.seed, record_path=args.record, **render)
+        engine.profiler.enabled = args.profile or args.trace is not None
+        if args.profile:
+            log_quality_changes(engine)
+        engine.run_headless(args.frames, dt=args.dt, draw=not args.no_draw)
+    else:
+        engine = GameEngine(seed=args.seed, record_path=args.record, **render)
+        engine.profiler.enabled = args.profile
+        if args.profile:
+            log_quality_changes(engine)
+        await engine.run()
+        return
+    engine.shutdown()
+    if args.trace:
+        count = engine.profiler.export_chrome_trace(args.trace)
+        print(f"Profiler: wrote {count} events to {args.trace}")
+    if args.profile:
+        for name, s in engine.profiler.stats().items():
+            print(f"{name:<18} min {s['min']:6.2f}  avg {s['avg']:6.2f}  p95 {s['p95']:6.2f}  p99 {s['p99']:6.2f} ms")
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -1,12 +1,55 @@
 """
 WhitePager - Game Constants
 """
-from typing import Tuple
+import os
+from typing import Dict, Tuple
 
 # Screen & Rendering
 SCREEN_WIDTH: int = 1280
 SCREEN_HEIGHT: int = 720
 FPS: int = 60
+# Internal resolution the world and post-processing render at before one upscale to the window
+RENDER_WIDTH: int = SCREEN_WIDTH
+RENDER_HEIGHT: int = SCREEN_HEIGHT
+SMOOTH_UPSCALE: bool = False  # smoothscale instead of nearest-neighbour when upscaling
+MAX_PARTICLES: int = 65536    # Fixed capacity of the particle store
+PARTICLE_GLOW: bool = False   # Soft additive halo stamped under every particle
+MAX_PROJECTILES: int = 4096   # Fixed capacity of the projectile buffer
+CULL_MARGIN: int = 16         # Px kept around the view so post-fx shifts don't reveal culled edges
+
+# Entity streaming: despawn beyond this x distance from the player, cap live counts per type
+STREAM_RADIUS: float = 2400.0
+ENTITY_BUDGETS: Dict[str, int] = {"enemies": 48, "echoes": 8, "bullets": 256}
+
+# Enemy/Echo movement: "vectorized" (one NumPy step per tick) or "sprites" (per-sprite update())
+SWARM_BACKEND: str = "vectorized"
+
+# Echoes waiting to spawn; bounds the backlog built up by long overworld runs
+ECHO_QUEUE_CAPACITY: int = 64
+
+# Byte budget for AssetManager's image cache (pinned entries are exempt from eviction)
+ASSET_CACHE_BUDGET: int = 64 * 1024 * 1024
+
+# Simulation timestep
+SIM_HZ: int = 60              # Fixed simulation tick rate
+SIM_DT: float = 1.0 / SIM_HZ
+MAX_FRAME_DT: float = 0.25    # Longer frames (asset loads, window drags) are clamped to this
+MAX_SIM_STEPS: int = 5        # Catch-up ticks per rendered frame before time is dropped
+
+# Pipelined rendering: post-process frame N on a worker thread while frame N+1 simulates
+PIPELINED_RENDER: bool = False
+PIPELINE_DEPTH: int = 1            # Frames queued or in flight on the worker (each adds a frame of latency)
+
+# Post-processing: "blend" (pygame blits/fills) or "numpy" (surfarray kernels),
+# which can split full-screen passes into row bands over POST_THREADS threads (1 = inline)
+POST_BACKEND: str = "blend"
+POST_THREADS: int = 1
+# Baked scanline + vignette overlays, one file per render resolution (None = don't cache)
+OVERLAY_CACHE_DIR: str = os.path.join(os.path.expanduser("~"), ".cache", "whitepager")
+
+# Frame profiler
+PROFILER_HISTORY: int = 300        # Frames kept for rolling stats and trace export
+PROFILER_TRACE_FRAMES: int = 300   # Frames written by the F4 trace dump
 
 # Colors (RGB)
 BLACK: Tuple[int, int, int] = (0, 0, 0)
@@ -4,11 +4,43 @@ Prioritizing redundant disk I/O reduction via caching.
 """
 import pygame
 import os
-from typing import Dict, Optional
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+from src.constants import ASSET_CACHE_BUDGET
+
+# (size, color, alpha, flip_x, premultiplied)
+SolidKey = Tuple[Tuple[int, int], Tuple[int, int, int], Optional[int], bool, bool]
+
+
+def surface_bytes(surface: pygame.Surface) -> int:
+    """Pixel memory owned by a surface (w * h * bytes per pixel)."""
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
 
 class AssetManager:
-    """Manages the caching of Pygame Surface objects to optimize memory/speed."""
-    _cache: Dict[str, pygame.Surface] = {}
+    """
+    Manages the caching of Pygame Surface objects to optimize memory/speed.
+    Image entries are tracked in bytes and evicted least-recently-used first once
+    the cache exceeds `budget_bytes`; pinned entries are never evicted.
+    """
+    _cache: "OrderedDict[str, pygame.Surface]" = OrderedDict()
+    _sizes: Dict[str, int] = {}  # Bytes charged per entry (0 for atlas subsurfaces)
+    _pinned: Set[str] = set()
+    _bytes: int = 0
+    budget_bytes: int = ASSET_CACHE_BUDGET
+    _solid_cache: Dict[SolidKey, pygame.Surface] = {}
+    # Once locked (after preloading), cache misses never touch the disk
+    _locked: bool = False
+    # Paths already reported missing, so each warning prints once
+    _missing: Set[str] = set()
+    _placeholder_surf: Optional[pygame.Surface] = None
+    _atlas_count: int = 0
+
+    # Stats
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
 
     @classmethod
     def get_image(cls, filepath: str) -> Optional[pygame.Surface]:
@@ -16,26 +48,200 @@ class AssetManager:
         Loads and returns an image, caching it.
         If the image is already cached, returns the cached surface.
         """
-        if filepath in cls._cache:
-            return cls._cache[filepath]
+        surface = cls._cache.get(filepath)
+        if surface is not None:
+            cls._cache.move_to_end(filepath)
+            cls.hits += 1
+            return surface
+        cls.misses += 1
+
+        if cls._locked:
+            # Not in the manifest: never stall a running frame on disk I/O
+            return cls._placeholder(filepath, "requested after preloading")
 
         if not os.path.exists(filepath):
             # In a hackathon, returning a placeholder surface is safer than crashing
-            print(f"Warning: Missing asset {filepath}, generating placeholder.")
-            placeholder = pygame.Surface((32, 32))
-            placeholder.fill((255, 0, 255))
-            cls._cache[filepath] = placeholder
-            return placeholder
+            return cls._placeholder(filepath, "missing")
 
         try:
             surface = pygame.image.load(filepath).convert_alpha()
-            cls._cache[filepath] = surface
+            cls._insert(filepath, surface)
             return surface
         except pygame.error as e:
             print(f"Error loading {filepath}: {e}")
             return None
 
+    @classmethod
+    def _placeholder(cls, filepath: str, reason: str) -> pygame.Surface:
+        """Shared magenta stand-in; never cached per path, warned about once per path."""
+        if filepath not in cls._missing:
+            cls._missing.add(filepath)
+            print(f"Warning: Asset {filepath} {reason}, using placeholder.")
+        if cls._placeholder_surf is None:
+            cls._placeholder_surf = pygame.Surface((32, 32))
+            cls._placeholder_surf.fill((255, 0, 255))
+        return cls._placeholder_surf
+
+    @classmethod
+    def _insert(cls, key: str, surface: pygame.Surface, size: Optional[int] = None, pin: bool = False):
+        cls._discard(key)
+        size = surface_bytes(surface) if size is None else size
+        cls._cache[key] = surface
+        cls._sizes[key] = size
+        cls._bytes += size
+        if pin:
+            cls._pinned.add(key)
+        cls._evict()
+
+    @classmethod
+    def _discard(cls, key: str):
+        if key in cls._cache:
+            del cls._cache[key]
+            cls._bytes -= cls._sizes.pop(key)
+            cls._pinned.discard(key)
+
+    @classmethod
+    def _evict(cls):
+        """Drops least-recently-used unpinned entries until the cache fits its budget."""
+        if cls._bytes <= cls.budget_bytes:
+            return
+        for key in list(cls._cache):
+            if cls._bytes <= cls.budget_bytes:
+                break
+            if key in cls._pinned:
+                continue
+            cls._discard(key)
+            cls.evictions += 1
+
+    @classmethod
+    def set_budget(cls, budget_bytes: int):
+        cls.budget_bytes = budget_bytes
+        cls._evict()
+
+    @classmethod
+    def pin(cls, filepath: str, pinned: bool = True):
+        """Marks a cached image as always needed (never evicted), or releases it."""
+        if not pinned:
+            cls._pinned.discard(filepath)
+            cls._evict()
+        elif filepath in cls._cache:
+            cls._pinned.add(filepath)
+
+    @classmethod
+    def store_image(cls, filepath: str, surface: pygame.Surface, pin: bool = False) -> pygame.Surface:
+        """Registers an already decoded image (e.g. from the preloader) under `filepath`."""
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        cls._insert(filepath, surface, pin=pin)
+        return surface
+
+    @classmethod
+    def build_atlas(cls, images: Dict[str, pygame.Surface], sheet_size: Tuple[int, int] = (1024, 1024),
+                    padding: int = 1) -> Dict[str, pygame.Surface]:
+        """
+        Shelf-packs small images into shared sheets and caches each one as a
+        subsurface of its sheet under its own key, so they share one allocation
+        and blit from one source. Sheets are pinned and charged to the cache;
+        images too large for a sheet are stored standalone.
+        """
+        sheet_w, sheet_h = sheet_size
+        # Tallest first keeps shelves tight
+        ordered = sorted(images.items(), key=lambda item: item[1].get_height(), reverse=True)
+        placements: List[List[Tuple[str, pygame.Surface, int, int]]] = [[]]
+        x = y = shelf_h = 0
+        result: Dict[str, pygame.Surface] = {}
+        for key, image in ordered:
+            w, h = image.get_size()
+            if w + padding > sheet_w or h + padding > sheet_h:
+                result[key] = cls.store_image(key, image)
+                continue
+            if x + w + padding > sheet_w:
+                x, y, shelf_h = 0, y + shelf_h, 0
+            if y + h + padding > sheet_h:
+                placements.append([])
+                x = y = shelf_h = 0
+            placements[-1].append((key, image, x, y))
+            x += w + padding
+            shelf_h = max(shelf_h, h + padding)
+
+        for placed in placements:
+            if not placed:
+                continue
+            used_h = max(py + img.get_height() for _, img, _, py in placed)
+            sheet = pygame.Surface((sheet_w, used_h), pygame.SRCALPHA)
+            if pygame.display.get_surface() is not None:
+                sheet = sheet.convert_alpha()
+            sheet.blits([(img, (px, py)) for _, img, px, py in placed], doreturn=False)
+            cls._atlas_count += 1
+            cls._insert(f"atlas:{cls._atlas_count}", sheet, pin=True)
+            for key, img, px, py in placed:
+                sub = sheet.subsurface((px, py, img.get_width(), img.get_height()))
+                # The sheet is charged for the pixels; its subsurfaces live as long as it does
+                cls._insert(key, sub, size=0, pin=True)
+                result[key] = sub
+        return result
+
+    @classmethod
+    def lock(cls, locked: bool = True):
+        """Forbids (or re-allows) disk loads on cache misses."""
+        cls._locked = locked
+
+    @classmethod
+    def get_solid(cls, size: Tuple[int, int], color: Tuple[int, int, int], alpha: Optional[int] = None,
+                  flip_x: bool = False, premultiplied: bool = False) -> pygame.Surface:
+        """
+        Returns a shared solid-color surface. Callers must treat it as immutable:
+        swap to another get_solid() surface instead of filling or flipping it.
+        alpha=None gives an opaque surface. With premultiplied=False alpha is a
+        per-surface alpha; with premultiplied=True the surface carries per-pixel
+        alpha with color already scaled by it, for blitting with
+        pygame.BLEND_PREMULTIPLIED.
+        """
+        key = (tuple(size), tuple(color), alpha, flip_x, premultiplied)
+        surface = cls._solid_cache.get(key)
+        if surface is not None:
+            return surface
+
+        converted = pygame.display.get_surface() is not None
+        if premultiplied:
+            a = 255 if alpha is None else alpha
+            surface = pygame.Surface(size, pygame.SRCALPHA)
+            if converted:
+                surface = surface.convert_alpha()
+            surface.fill((color[0] * a // 255, color[1] * a // 255, color[2] * a // 255, a))
+        else:
+            surface = pygame.Surface(size)
+            if converted:
+                surface = surface.convert()
+            surface.fill(color)
+            if alpha is not None:
+                surface.set_alpha(alpha)
+        if flip_x:
+            surface = pygame.transform.flip(surface, True, False)
+
+        cls._solid_cache[key] = surface
+        return surface
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        return {
+            "entries": len(cls._cache),
+            "bytes": cls._bytes,
+            "budget_bytes": cls.budget_bytes,
+            "pinned": len(cls._pinned),
+            "hits": cls.hits,
+            "misses": cls.misses,
+            "evictions": cls.evictions,
+            "solid_entries": len(cls._solid_cache),
+            "solid_bytes": sum(surface_bytes(s) for s in cls._solid_cache.values()),
+        }
+
     @classmethod
     def clear_cache(cls):
         """Releases cached assets."""
         cls._cache.clear()
+        cls._sizes.clear()
+        cls._pinned.clear()
+        cls._bytes = 0
+        cls._solid_cache.clear()
+        cls._missing.clear()
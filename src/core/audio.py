@@ -3,19 +3,135 @@ WhitePager - Audio Manager
 Handles music playback speed and SFX triggers.
 """
 import pygame
-import os
+from typing import BinaryIO, Dict, List, Optional
+
+from src.constants import SCREEN_WIDTH
+from src.core.preload import AssetPreloader
+
+# Channels reserved per SFX category, so rapid fire can never starve key cues
+SFX_CATEGORY_CHANNELS: Dict[str, int] = {"weapon": 3, "impact": 3, "event": 2}
+
+# Per-sound voice settings: category, priority (higher steals lower), and the
+# minimum seconds between two starts of the same sound
+SFX_VOICES: Dict[str, dict] = {
+    "shoot": {"category": "weapon", "priority": 1, "min_interval": 0.06},
+    "hurt": {"category": "impact", "priority": 2, "min_interval": 0.08},
+    "revival": {"category": "event", "priority": 3, "min_interval": 0.0},
+    "underground_death": {"category": "event", "priority": 3, "min_interval": 0.0},
+}
+
+# SFX from events farther than this from the listener are culled
+SFX_CULL_DISTANCE: float = SCREEN_WIDTH
+
+
+class VoicePool:
+    """
+    Managed SFX voices on reserved mixer channels. A play request is dropped if
+    the sound retriggers too soon, is too far from the listener, or finds every
+    channel of its category busy with equal-or-higher priority voices; otherwise
+    it takes a free channel or steals the lowest-priority, oldest one.
+    Time is advanced by the caller, so behaviour follows simulation time.
+    """
+    def __init__(self, sounds: Dict[str, pygame.mixer.Sound], voices: Dict[str, dict] = SFX_VOICES,
+                 category_channels: Dict[str, int] = SFX_CATEGORY_CHANNELS,
+                 cull_distance: Optional[float] = SFX_CULL_DISTANCE):
+        self.sounds = sounds
+        self.voices = voices
+        self.cull_distance = cull_distance
+        self.now = 0.0
+        self.listener_x: Optional[float] = None
+
+        # Reserve the first N channels so Sound.play() elsewhere never takes them
+        total = sum(category_channels.values())
+        if pygame.mixer.get_num_channels() < total:
+            pygame.mixer.set_num_channels(total)
+        pygame.mixer.set_reserved(total)
+        self.channels: Dict[str, List[pygame.mixer.Channel]] = {}
+        index = 0
+        for category, count in category_channels.items():
+            self.channels[category] = [pygame.mixer.Channel(index + i) for i in range(count)]
+            index += count
+        # channel id -> (priority, start time) of the voice it is playing
+        self._voice_info: Dict[int, tuple] = {}
+        self._last_start: Dict[str, float] = {}
+
+        # Stats
+        self.played = 0
+        self.stolen = 0
+        self.dropped: Dict[str, int] = {"retrigger": 0, "distance": 0, "busy": 0}
+
+    def advance(self, dt: float):
+        self.now += dt
+
+    def play(self, name: str, x: Optional[float] = None) -> bool:
+        """Plays sound `name`, optionally emitted at world x. Returns False if dropped."""
+        voice = self.voices[name]
+        last = self._last_start.get(name)
+        if last is not None and self.now - last < voice["min_interval"]:
+            self.dropped["retrigger"] += 1
+            return False
+        if (x is not None and self.listener_x is not None and self.cull_distance is not None
+                and abs(x - self.listener_x) > self.cull_distance):
+            self.dropped["distance"] += 1
+            return False
+
+        channel = self._find_channel(voice["category"], voice["priority"])
+        if channel is None:
+            self.dropped["busy"] += 1
+            return False
+        channel.play(self.sounds[name])
+        self._voice_info[id(channel)] = (voice["priority"], self.now)
+        self._last_start[name] = self.now
+        self.played += 1
+        return True
+
+    def _find_channel(self, category: str, priority: int) -> Optional[pygame.mixer.Channel]:
+        victim = None
+        victim_key = None
+        for channel in self.channels[category]:
+            if not channel.get_busy():
+                return channel
+            playing_priority, started = self._voice_info.get(id(channel), (0, 0.0))
+            if playing_priority <= priority:
+                key = (playing_priority, started)
+                if victim_key is None or key < victim_key:
+                    victim, victim_key = channel, key
+        if victim is not None:
+            victim.stop()
+            self.stolen += 1
+        return victim
+
+    def active_voices(self) -> int:
+        return sum(ch.get_busy() for chans in self.channels.values() for ch in chans)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "active": self.active_voices(),
+            "played": self.played,
+            "stolen": self.stolen,
+            **{f"dropped_{reason}": count for reason, count in self.dropped.items()},
+        }
 
-SFX_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "SFX")
 
 class AudioManager:
-    def __init__(self):
-        pygame.mixer.init()
+    def __init__(self, sounds: Optional[Dict[str, pygame.mixer.Sound]] = None, music: Optional[BinaryIO] = None):
+        """
+        sounds/music: decoded SFX by manifest name and the music file object, normally
+        from AssetPreloader. Without them the manifest is loaded synchronously here.
+        """
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        
+        if sounds is None:
+            preloader = AssetPreloader()
+            preloader.load_blocking()
+            sounds, music = preloader.sounds, preloader.music
         
-        # Load SFX
-        self.sfx_shoot = pygame.mixer.Sound(os.path.join(SFX_DIR, "GunshotSFX.ogg"))
-        self.sfx_hurt = pygame.mixer.Sound(os.path.join(SFX_DIR, "HurtSfx.ogg"))
-        self.sfx_revival = pygame.mixer.Sound(os.path.join(SFX_DIR, "Revival.ogg"))
-        self.sfx_underground_death = pygame.mixer.Sound(os.path.join(SFX_DIR, "Underground death.ogg"))
+        # SFX
+        self.sfx_shoot = sounds["shoot"]
+        self.sfx_hurt = sounds["hurt"]
+        self.sfx_revival = sounds["revival"]
+        self.sfx_underground_death = sounds["underground_death"]
         
         # Lower volumes slightly so they don't clip
         self.sfx_shoot.set_volume(0.4)
@@ -23,13 +139,21 @@ class AudioManager:
         self.sfx_revival.set_volume(0.8)
         self.sfx_underground_death.set_volume(0.7)
         
-        # Music
-        self.music_path = os.path.join(SFX_DIR, "Game Music.mp3")
+        self.voices = VoicePool({
+            "shoot": self.sfx_shoot,
+            "hurt": self.sfx_hurt,
+            "revival": self.sfx_revival,
+            "underground_death": self.sfx_underground_death,
+        })
+        
+        # Music, streamed from the preloaded file bytes
+        self.music = music
         self._current_speed = 1.0
         
     def start_music(self):
         """Begin looping the game music."""
-        pygame.mixer.music.load(self.music_path)
+        self.music.seek(0)
+        pygame.mixer.music.load(self.music)
         pygame.mixer.music.set_volume(0.8)
         pygame.mixer.music.play(-1)  # Loop forever
         
@@ -59,14 +183,19 @@ class AudioManager:
             intensity_volume = 0.6 + (1.0 - ratio) * 0.4  # 0.6 at full, 1.0 at low
             pygame.mixer.music.set_volume(min(1.0, intensity_volume))
     
-    def play_shoot(self):
-        self.sfx_shoot.play()
+    def update(self, dt: float, listener_x: float):
+        """Advances the voice pool clock and moves the listener (the player)."""
+        self.voices.advance(dt)
+        self.voices.listener_x = listener_x
+    
+    def play_shoot(self, x: Optional[float] = None):
+        self.voices.play("shoot", x)
         
-    def play_hurt(self):
-        self.sfx_hurt.play()
+    def play_hurt(self, x: Optional[float] = None):
+        self.voices.play("hurt", x)
         
     def play_revival(self):
-        self.sfx_revival.play()
+        self.voices.play("revival")
         
     def play_underground_death(self):
-        self.sfx_underground_death.play()
+        self.voices.play("underground_death")
@@ -0,0 +1,56 @@
+"""
+WhitePager - Collision Broadphase
+The world is a thin horizontal strip around SURFACE_Y, so sorting sprites by
+their left edge and sweeping over x prunes almost every pair cheaply.
+"""
+import pygame
+from bisect import bisect_left, bisect_right
+from typing import Iterable, List
+
+
+def _left(sprite: pygame.sprite.Sprite) -> int:
+    return sprite.rect.left
+
+
+class SweepIndex:
+    """
+    Sweep-and-prune index over a set of sprites, sorted by rect.left.
+    Rebuild it once per tick after the sprites move; the previous tick's order
+    is kept so the sort is near-linear on already-sorted data.
+    """
+    def __init__(self):
+        self._sprites: List[pygame.sprite.Sprite] = []
+        self._lefts: List[int] = []
+        self._max_width = 0
+
+    def __len__(self) -> int:
+        return len(self._sprites)
+
+    def rebuild(self, sprites: Iterable[pygame.sprite.Sprite]):
+        """Re-sorts the index from the current sprite positions."""
+        sprites = list(sprites)
+        live = set(sprites)
+        # Keep the previous order for survivors, then append newcomers in the
+        # caller's order (not set order, which follows object ids), so ties on
+        # rect.left resolve the same way in every process
+        ordered = [s for s in self._sprites if s in live]
+        if len(ordered) != len(live):
+            known = set(ordered)
+            ordered.extend(s for s in sprites if s not in known)
+        ordered.sort(key=_left)
+
+        self._sprites = ordered
+        self._lefts = [s.rect.left for s in ordered]
+        self._max_width = max((s.rect.width for s in ordered), default=0)
+
+    def query(self, rect: pygame.Rect) -> List[pygame.sprite.Sprite]:
+        """Returns the live indexed sprites whose rects overlap `rect`."""
+        # Anything overlapping must start within max_width to the left of rect
+        lo = bisect_left(self._lefts, rect.left - self._max_width)
+        hi = bisect_right(self._lefts, rect.right)
+        hits = []
+        for i in range(lo, hi):
+            sprite = self._sprites[i]
+            if rect.colliderect(sprite.rect) and sprite.alive():
+                hits.append(sprite)
+        return hits
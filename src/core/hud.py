@@ -0,0 +1,81 @@
+"""
+WhitePager - HUD Layer
+Text widgets rendered once per distinct value and composited from a cached overlay.
+"""
+import pygame
+from typing import Dict, Optional, Tuple
+
+TEXT_CACHE_SIZE: int = 256
+
+
+class HUD:
+    """
+    Named text widgets drawn over the final frame. A widget is only re-rendered
+    when its text, color or position changes; the overlay surface is only
+    recomposed when some widget changed, and each frame is a single blit of the
+    overlay's occupied region.
+    """
+    def __init__(self, w: int, h: int):
+        self.w = w
+        self.h = h
+        # Fonts are created once, never per frame
+        self.fonts: Dict[str, pygame.font.Font] = {
+            "body": pygame.font.SysFont(None, 36),
+            "title": pygame.font.SysFont(None, 48),
+        }
+        # (text, font name, color) -> rendered surface, oldest evicted first
+        self._text_cache: Dict[Tuple[str, str, Tuple[int, int, int]], pygame.Surface] = {}
+        # widget name -> (text, font name, color, pos, center_x)
+        self._widgets: Dict[str, tuple] = {}
+
+        self.overlay = pygame.Surface((w, h), pygame.SRCALPHA)
+        self._bbox: Optional[pygame.Rect] = None
+        self._dirty = False
+
+        # Stats
+        self.renders = 0
+        self.recomposes = 0
+
+    def render_text(self, text: str, font: str, color: Tuple[int, int, int]) -> pygame.Surface:
+        """Returns the cached rendering of `text`, rendering it on first use."""
+        key = (text, font, color)
+        surface = self._text_cache.get(key)
+        if surface is None:
+            surface = self.fonts[font].render(text, True, color)
+            self.renders += 1
+            if len(self._text_cache) >= TEXT_CACHE_SIZE:
+                del self._text_cache[next(iter(self._text_cache))]
+            self._text_cache[key] = surface
+        return surface
+
+    def set_text(self, name: str, text: str, color: Tuple[int, int, int], pos: Tuple[int, int],
+                 font: str = "body", center_x: bool = False):
+        """Shows widget `name`. With center_x, pos[0] is the horizontal center instead of the left edge."""
+        widget = (text, font, color, pos, center_x)
+        if self._widgets.get(name) != widget:
+            self._widgets[name] = widget
+            self._dirty = True
+
+    def hide(self, name: str):
+        if self._widgets.pop(name, None) is not None:
+            self._dirty = True
+
+    def _recompose(self):
+        if self._bbox is not None:
+            self.overlay.fill((0, 0, 0, 0), self._bbox)
+        bbox = None
+        for text, font, color, (x, y), center_x in self._widgets.values():
+            surface = self.render_text(text, font, color)
+            if center_x:
+                x -= surface.get_width() // 2
+            rect = self.overlay.blit(surface, (x, y))
+            bbox = rect if bbox is None else bbox.union(rect)
+        self._bbox = bbox
+        self._dirty = False
+        self.recomposes += 1
+
+    def draw(self, screen: pygame.Surface):
+        if self._dirty:
+            self._recompose()
+        if self._bbox is not None:
+            screen.blit(self.overlay, self._bbox.topleft, self._bbox)
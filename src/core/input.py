@@ -0,0 +1,94 @@
+"""
+WhitePager - Input Sources
+Decouples the engine from pygame's global keyboard/mouse state so the game
+can be driven by a live player or by a scripted bot.
+"""
+import pygame
+import random
+from typing import Iterable, List, Tuple
+
+
+class KeyState(frozenset):
+    """Set of held key codes, indexable like pygame.key.get_pressed()."""
+    def __getitem__(self, key: int) -> bool:
+        return key in self
+
+
+class LiveInput:
+    """Reads the real keyboard, mouse and event queue."""
+    def begin_frame(self, engine):
+        pass
+
+    def get_events(self) -> List[pygame.event.Event]:
+        return pygame.event.get()
+
+    def get_pressed(self):
+        return pygame.key.get_pressed()
+
+    def get_mouse_pressed(self) -> Tuple[bool, bool, bool]:
+        return pygame.mouse.get_pressed()
+
+    def get_mouse_pos(self) -> Tuple[int, int]:
+        return pygame.mouse.get_pos()
+
+
+class BotInput:
+    """
+    Deterministic scripted player. Wanders left/right, holds fire at the
+    nearest target and occasionally jumps, dashes or melees. All choices
+    come from the supplied RNG so runs are reproducible for a given seed.
+    """
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+        self.direction = 1
+        self.keys = KeyState()
+        self.events: List[pygame.event.Event] = []
+        self.mouse_pos = (0, 0)
+
+    def _nearest(self, sprites: Iterable[pygame.sprite.Sprite], x: float):
+        nearest = None
+        best = float("inf")
+        for sprite in sprites:
+            dist = abs(sprite.rect.centerx - x)
+            if dist < best:
+                best = dist
+                nearest = sprite
+        return nearest
+
+    def begin_frame(self, engine):
+        """Decides this frame's inputs from the engine state."""
+        player = engine.player
+        if self.rng.random() < 0.02:
+            self.direction = -self.direction
+
+        held = {pygame.K_d if self.direction > 0 else pygame.K_a}
+        if self.rng.random() < 0.03:
+            held.add(pygame.K_SPACE)
+        self.keys = KeyState(held)
+
+        self.events = []
+        if self.rng.random() < 0.01:
+            self.events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_LSHIFT))
+        if self.rng.random() < 0.05:
+            self.events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_k))
+
+        targets = engine.enemies if player.is_alive else engine.echoes
+        target = self._nearest(targets, player.pos_x)
+        cx, cy = engine.camera.get_offset()
+        if target is not None:
+            self.mouse_pos = (target.rect.centerx + cx, target.rect.centery + cy)
+        else:
+            self.mouse_pos = (int(player.pos_x) + cx + self.direction * 200, int(player.pos_y) + cy)
+
+    def get_events(self) -> List[pygame.event.Event]:
+        pygame.event.pump()
+        return self.events
+
+    def get_pressed(self) -> KeyState:
+        return self.keys
+
+    def get_mouse_pressed(self) -> Tuple[bool, bool, bool]:
+        return (True, False, False)
+
+    def get_mouse_pos(self) -> Tuple[int, int]:
+        return self.mouse_pos
@@ -0,0 +1,179 @@
+"""
+WhitePager - Packed Asset Archive
+Every manifest entry in one indexed file, stored in the form the loaders want:
+sound effects as raw mixer PCM, images as raw pixels, music as its encoded
+stream. The archive is memory-mapped and entries are handed to pygame as
+memoryview slices of the map, so loading is a page-in rather than a file open,
+read and decode per asset. The pygbag build bundles the same file.
+
+Build it from the repo root (before packaging the web build):
+    python -m src.core.pack
+"""
+import io
+import json
+import mmap
+import os
+import struct
+import pygame
+from typing import Dict, List, Tuple
+
+PACK_MAGIC = b"WPAK"
+PACK_VERSION = 1
+PACK_ALIGN = 16  # Blob alignment inside the archive
+
+# magic, version, index offset, index length
+_HEADER = struct.Struct("<4sBQI")
+
+
+class PackReader(io.RawIOBase):
+    """Seekable read-only file object over a memoryview, for loaders that want a file (music streaming)."""
+    def __init__(self, view: memoryview):
+        super().__init__()
+        self.view = view
+        self.pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        n = max(0, min(len(buffer), len(self.view) - self.pos))
+        buffer[:n] = self.view[self.pos:self.pos + n]
+        self.pos += n
+        return n
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self.pos, io.SEEK_END: len(self.view)}[whence]
+        self.pos = max(0, base + offset)
+        return self.pos
+
+    def tell(self) -> int:
+        return self.pos
+
+
+class AssetPack:
+    """
+    Read side of the archive. Entries are keyed by manifest name; each has a
+    kind, one or more named blobs ((offset, length) into the file) and the
+    metadata needed to rebuild the asset from them.
+    """
+    def __init__(self, data, index: Dict[str, dict], path: str = ""):
+        self.path = path
+        self.data = data  # mmap (or bytes where mmap is unavailable)
+        self.view = memoryview(data)
+        self.entries = index["entries"]
+
+    @classmethod
+    def open(cls, path: str) -> "AssetPack":
+        with open(path, "rb") as f:
+            try:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError, AttributeError):  # e.g. no mmap on the web build
+                data = f.read()
+        magic, version, index_offset, index_len = _HEADER.unpack_from(data)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            raise ValueError(f"Not a version {PACK_VERSION} asset pack: {path}")
+        index = json.loads(bytes(data[index_offset:index_offset + index_len]))
+        return cls(data, index, path)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def blob(self, name: str, blob: str) -> memoryview:
+        """Zero-copy slice of one of an entry's blobs."""
+        offset, length = self.entries[name]["blobs"][blob]
+        return self.view[offset:offset + length]
+
+    def is_current(self, entry: dict) -> bool:
+        """
+        Whether the packed copy of a manifest entry can be used: it must be in
+        the pack, and if the loose source file is present it must still have the
+        size it was packed at (mtimes don't survive the web bundle's zip).
+        """
+        packed = self.entries.get(entry["name"])
+        if packed is None or packed["kind"] != entry["kind"]:
+            return False
+        try:
+            return os.path.getsize(entry["path"]) == packed["source_size"]
+        except OSError:
+            return True  # Shipped without the loose files
+
+    def load(self, entry: dict):
+        """Rebuilds a manifest entry's asset from the pack, as AssetPreloader._decode would from disk."""
+        name, kind = entry["name"], entry["kind"]
+        packed = self.entries[name]
+        if kind == "sound":
+            if tuple(packed["mixer"]) == pygame.mixer.get_init():
+                return pygame.mixer.Sound(buffer=self.blob(name, "pcm"))
+            # Mixer opened with another format: decode the original stream instead
+            return pygame.mixer.Sound(file=PackReader(self.blob(name, "source")))
+        if kind == "music":
+            return io.BufferedReader(PackReader(self.blob(name, "source")))
+        if kind == "image":
+            return pygame.image.frombuffer(self.blob(name, "pixels"), tuple(packed["size"]), packed["format"])
+        raise ValueError(f"Unknown asset kind: {kind}")
+
+
+def _pack_entry(entry: dict) -> Tuple[dict, Dict[str, bytes]]:
+    """Index metadata and blobs for one manifest entry."""
+    kind = entry["kind"]
+    with open(entry["path"], "rb") as f:
+        source = f.read()
+    meta = {"kind": kind, "source_size": len(source)}
+    if kind == "sound":
+        # Decoded at the mixer's current format; the source rides along for other formats
+        meta["mixer"] = list(pygame.mixer.get_init())
+        return meta, {"pcm": pygame.mixer.Sound(file=entry["path"]).get_raw(), "source": source}
+    if kind == "music":
+        return meta, {"source": source}  # Streamed, so it stays encoded
+    if kind == "image":
+        image = pygame.image.load(entry["path"])
+        fmt = "RGBA" if image.get_alpha() is not None or image.get_colorkey() is not None else "RGB"
+        meta["size"] = list(image.get_size())
+        meta["format"] = fmt
+        return meta, {"pixels": pygame.image.tobytes(image, fmt)}
+    raise ValueError(f"Unknown asset kind: {kind}")
+
+
+def build_pack(manifest: List[dict], path: str) -> int:
+    """Writes every manifest entry into an archive at `path`. Returns its size in bytes."""
+    if not pygame.mixer.get_init():
+        pygame.mixer.init()
+    entries: Dict[str, dict] = {}
+    body = bytearray()
+    for entry in manifest:
+        meta, blobs = _pack_entry(entry)
+        meta["blobs"] = {}
+        for blob_name, data in blobs.items():
+            body.extend(b"\0" * (-(_HEADER.size + len(body)) % PACK_ALIGN))
+            meta["blobs"][blob_name] = [_HEADER.size + len(body), len(data)]
+            body.extend(data)
+        entries[entry["name"]] = meta
+    index = json.dumps({"entries": entries}, separators=(",", ":")).encode()
+    header = _HEADER.pack(PACK_MAGIC, PACK_VERSION, _HEADER.size + len(body), len(index))
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(body)
+        f.write(index)
+    os.replace(tmp_path, path)
+    return os.path.getsize(path)
+
+
+def main():
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    from src.core.preload import ASSET_MANIFEST, ASSET_PACK_PATH
+
+    size = build_pack(ASSET_MANIFEST, ASSET_PACK_PATH)
+    source = sum(os.path.getsize(entry["path"]) for entry in ASSET_MANIFEST)
+    print(f"Packed {len(ASSET_MANIFEST)} assets into {ASSET_PACK_PATH}: "
+          f"{size / 1024:.0f} KiB ({source / 1024:.0f} KiB of source files)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+WhitePager - Pipelined Rendering
+Post-processes and upscales frame N on a worker thread while the main thread
+handles events, simulates and draws the world for frame N+1. pygame releases
+the GIL inside its full-screen blends and scales, so the two overlap on a
+multi-core machine.
+"""
+import queue
+import threading
+import time
+import pygame
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from src.constants import PIPELINE_DEPTH, PROFILER_HISTORY
+from src.core.profiler import FrameProfiler
+
+# process(world_surface, dt, zoom): post-processing + zoom into the window surface
+ProcessCallback = Callable[[pygame.Surface, float, float], None]
+
+
+class RenderPipeline:
+    """
+    Double-buffered hand-off between the main thread and one render worker.
+    The main thread draws into back_buffer(), then submit()s it; at most
+    `depth` frames are queued or in flight, so submit() blocks when the worker
+    falls behind instead of letting latency grow. wait() returns once the
+    oldest submitted frame is fully processed and may be presented (HUD + flip
+    stay on the main thread, where SDL wants them). Profiler sections timed on
+    the worker travel back with their frame and are merged when wait() returns it.
+    """
+    def __init__(self, process: ProcessCallback, size: Tuple[int, int], depth: int = PIPELINE_DEPTH,
+                 profiler: Optional[FrameProfiler] = None):
+        self.process = process
+        self.depth = depth
+        self.profiler = profiler
+        # One buffer being drawn by the main thread plus one per frame in flight
+        self.buffers: List[pygame.Surface] = [pygame.Surface(size).convert() for _ in range(depth + 1)]
+        self._next = 0
+        self._jobs: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize=depth)
+        self._done: "queue.Queue[tuple]" = queue.Queue()
+        self.in_flight = 0
+        self._error: Optional[BaseException] = None
+
+        # Stats (ms)
+        self.frames = 0
+        self.worker_ms: Deque[float] = deque(maxlen=PROFILER_HISTORY)    # time the worker spent per frame
+        self.wait_ms: Deque[float] = deque(maxlen=PROFILER_HISTORY)      # main thread blocked on the worker
+
+        self._thread = threading.Thread(target=self._worker, name="render-pipeline", daemon=True)
+        self._thread.start()
+
+    def back_buffer(self) -> pygame.Surface:
+        """The buffer the main thread should draw the next frame into."""
+        return self.buffers[self._next]
+
+    def submit(self, dt: float, zoom: float, frame_start: float):
+        """Hands the back buffer to the worker and rotates to the next buffer."""
+        if self._error is not None:
+            raise RuntimeError("Render worker failed") from self._error
+        self._jobs.put((self.buffers[self._next], dt, zoom, frame_start))
+        self.in_flight += 1
+        self._next = (self._next + 1) % len(self.buffers)
+
+    def wait(self) -> Optional[float]:
+        """Blocks until the oldest in-flight frame is processed. Returns its frame start, or None if idle."""
+        if self.in_flight == 0:
+            return None
+        start = time.perf_counter()
+        frame_start, worker_ms, error, sections = self._done.get()
+        self.wait_ms.append((time.perf_counter() - start) * 1000.0)
+        self.in_flight -= 1
+        if self.profiler is not None:
+            self.profiler.merge(sections)
+        if error is not None:
+            self._error = error
+            raise RuntimeError("Render worker failed") from error
+        self.frames += 1
+        self.worker_ms.append(worker_ms)
+        return frame_start
+
+    def close(self):
+        """Stops the worker once everything submitted has been processed."""
+        if self._thread.is_alive():
+            self._jobs.put(None)
+            self._thread.join()
+
+    def _worker(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            surface, dt, zoom, frame_start = job
+            start = time.perf_counter()
+            error = None
+            sections = []
+            try:
+                if self.profiler is not None:
+                    with self.profiler.capture(sections):
+                        self.process(surface, dt, zoom)
+                else:
+                    self.process(surface, dt, zoom)
+            except BaseException as e:  # Surfaced on the main thread by wait()
+                error = e
+            self._done.put((frame_start, (time.perf_counter() - start) * 1000.0, error, sections))
+
+    def stats(self) -> Dict[str, float]:
+        def avg(values) -> float:
+            return sum(values) / len(values) if values else 0.0
+        return {
+            "frames": self.frames,
+            "worker_ms": avg(self.worker_ms),
+            "wait_ms": avg(self.wait_ms),
+        }
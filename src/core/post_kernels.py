@@ -0,0 +1,178 @@
+"""
+WhitePager - NumPy Post-Processing Kernels
+Array versions of the chromatic aberration and bloom passes, used by
+PostProcessor when its backend is "numpy". Surfaces are read through their raw
+32-bit pixel buffer as rows of bytes (h, w * 4), so every pass is a contiguous
+row operation and a row band is a slice along axis 0. Per-channel weights are
+tiled along the row in the surface's own byte order.
+"""
+import sys
+import numpy as np
+import pygame
+from concurrent.futures import Executor
+from typing import Dict, List, Optional, Tuple
+
+# Aberration weights in 1/64ths, per output channel (R, G, B): the centre pixel
+# and the copies shifted right and left. Same tints as the blend path:
+# centre * (180, 200, 180), right shift * (255, 100, 100), left shift * (100, 100, 255).
+_AB_SHIFT = 6
+_AB_CENTER = (45, 50, 45)
+_AB_RIGHT = (64, 25, 25)
+_AB_LEFT = (25, 25, 64)
+_U8_MAX = np.uint16(255)
+
+# Separable 5-tap binomial blur
+_BLUR_TAPS = (1.0 / 16, 4.0 / 16, 6.0 / 16, 4.0 / 16, 1.0 / 16)
+_LUMA = (0.299, 0.587, 0.114)
+
+# Scratch arrays reused across frames, keyed by (name, shape)
+_scratch: Dict[Tuple[str, tuple], np.ndarray] = {}
+
+
+def row_bands(height: int, count: int) -> List[Tuple[int, int]]:
+    """Splits [0, height) into `count` contiguous (start, end) row ranges."""
+    count = max(1, min(count, height))
+    edges = np.linspace(0, height, count + 1).astype(int)
+    return [(int(a), int(b)) for a, b in zip(edges[:-1], edges[1:]) if b > a]
+
+
+def _rows(surface: pygame.Surface) -> np.ndarray:
+    """(h, w * 4) uint8 view of a 32-bit surface's pixels. Locks it until released."""
+    if surface.get_bytesize() != 4:
+        raise ValueError("NumPy post-processing needs 32-bit surfaces")
+    w, h = surface.get_size()
+    data = np.frombuffer(surface.get_buffer(), dtype=np.uint8)
+    return data.reshape(h, surface.get_pitch())[:, :w * 4]
+
+
+def _channel_weights(surface: pygame.Surface, rgb, pad, dtype) -> np.ndarray:
+    """Per-byte weights for one pixel: `rgb` on the R, G, B bytes, `pad` on the fourth."""
+    weights = [pad] * 4
+    for shift, value in zip(surface.get_shifts()[:3], rgb):
+        byte = shift // 8
+        weights[byte if sys.byteorder == "little" else 3 - byte] = value
+    return np.array(weights, dtype=dtype)
+
+
+def _buffer(name: str, shape: tuple, dtype) -> np.ndarray:
+    key = (name, shape)
+    buf = _scratch.get(key)
+    if buf is None or buf.dtype != dtype:
+        buf = _scratch[key] = np.empty(shape, dtype=dtype)
+    return buf
+
+
+def _aberration_band(src, dst, acc, tmp, over, weights, shift: int, y0: int, y1: int):
+    center, right, left = weights
+    s, a, t, o, d = src[y0:y1], acc[y0:y1], tmp[y0:y1], over[y0:y1], dst[y0:y1]
+    np.multiply(s, center, out=a)
+    # Copy shifted right: red-tinted, lands `shift` bytes further along the row
+    np.multiply(s[:, :-shift], right[:-shift], out=t[:, :-shift])
+    np.add(a[:, shift:], t[:, :-shift], out=a[:, shift:])
+    # Copy shifted left: blue-tinted
+    np.multiply(s[:, shift:], left[shift:], out=t[:, shift:])
+    np.add(a[:, :-shift], t[:, shift:], out=a[:, :-shift])
+    np.right_shift(a, _AB_SHIFT, out=a)
+    # Saturate to 255 (np.minimum on uint16 is several times slower than this)
+    np.greater(a, _U8_MAX, out=o)
+    np.copyto(d, a, casting="unsafe")
+    np.copyto(d, _U8_MAX, where=o, casting="unsafe")
+
+
+def chromatic_aberration(source: pygame.Surface, dest: pygame.Surface, offset: int = 3,
+                         pool: Optional[Executor] = None, bands: int = 1):
+    """
+    Writes `source` with its red channel shifted right and blue shifted left by
+    `offset` px into `dest`, in one weighted pass per pixel. With a pool the
+    rows are split into `bands` independent jobs (NumPy releases the GIL).
+    """
+    src = _rows(source)
+    dst = _rows(dest)
+    try:
+        row = src.shape[1] // 4
+        # The spare byte keeps its value (weight 64/64)
+        weights = tuple(np.tile(_channel_weights(source, rgb, 1 << _AB_SHIFT if rgb is _AB_CENTER else 0,
+                                                 np.uint16), row)
+                        for rgb in (_AB_CENTER, _AB_RIGHT, _AB_LEFT))
+        acc = _buffer("aberration.acc", src.shape, np.uint16)
+        tmp = _buffer("aberration.tmp", src.shape, np.uint16)
+        over = _buffer("aberration.over", src.shape, np.bool_)
+        shift = offset * 4
+        ranges = row_bands(src.shape[0], bands)
+        if pool is None or len(ranges) == 1:
+            for y0, y1 in ranges:
+                _aberration_band(src, dst, acc, tmp, over, weights, shift, y0, y1)
+        else:
+            list(pool.map(lambda r: _aberration_band(src, dst, acc, tmp, over, weights, shift, *r), ranges))
+    finally:
+        # Release the surface locks before anything blits these surfaces
+        del src, dst
+
+
+def _blur(a: np.ndarray) -> np.ndarray:
+    """Separable binomial blur of an (h, w, 4) image along x then y, edges clamped."""
+    for axis in (1, 0):
+        n = a.shape[axis]
+        pad = [(0, 0)] * a.ndim
+        pad[axis] = (2, 2)
+        p = np.pad(a, pad, mode="edge")
+        out = np.zeros_like(a)
+        taps = [slice(None)] * a.ndim
+        for i, w in enumerate(_BLUR_TAPS):
+            taps[axis] = slice(i, i + n)
+            out += w * p[tuple(taps)]
+        a = out
+    return a
+
+
+def _downsample(a: np.ndarray) -> np.ndarray:
+    """2x2 box average (odd trailing row/column dropped)."""
+    h, w = a.shape[0] // 2 * 2, a.shape[1] // 2 * 2
+    a = a[:h, :w]
+    return 0.25 * (a[0::2, 0::2] + a[1::2, 0::2] + a[0::2, 1::2] + a[1::2, 1::2])
+
+
+def _upsample(a: np.ndarray, shape: Tuple[int, int]) -> np.ndarray:
+    """Nearest 2x upsample, edge-padded or cropped to `shape`."""
+    a = a.repeat(2, axis=0).repeat(2, axis=1)[:shape[0], :shape[1]]
+    pad_h, pad_w = shape[0] - a.shape[0], shape[1] - a.shape[1]
+    if pad_h or pad_w:
+        a = np.pad(a, ((0, pad_h), (0, pad_w), (0, 0)), mode="edge")
+    return a
+
+
+def bloom(source: pygame.Surface, small: pygame.Surface, upscaled: pygame.Surface, dest: pygame.Surface,
+          threshold: float = 150.0, levels: int = 3, intensity: float = 1.5):
+    """
+    Bright-pass + blurred mip chain bloom, added onto `dest`.
+    `source` is box-filtered down into `small` (the bloom buffer), pixels whose
+    luminance exceeds `threshold` keep the part of their color above it, and
+    that image plus `levels - 1` halvings are each blurred and summed back at
+    the bloom buffer's size. The result is scaled up into `upscaled` and added.
+    """
+    pygame.transform.smoothscale(source, small.get_size(), small)
+    rows = _rows(small)
+    try:
+        px = rows.reshape(rows.shape[0], -1, 4)
+        a = px.astype(np.float32)
+        lum = a @ _channel_weights(small, _LUMA, 0.0, np.float32)
+        keep = np.clip(lum - threshold, 0.0, None) / np.maximum(lum, 1.0)
+        level = a * keep[..., None]
+
+        total = _blur(level)
+        chain = [total]
+        for _ in range(levels - 1):
+            if min(level.shape[0], level.shape[1]) < 4:
+                break
+            level = _downsample(level)
+            chain.append(_blur(level))
+        # Collapse from the coarsest level up, each step doubling resolution
+        acc = chain[-1]
+        for finer in reversed(chain[:-1]):
+            acc = finer + _upsample(acc, finer.shape[:2])
+        np.clip(acc * (intensity / len(chain)), 0.0, 255.0, out=acc)
+        np.copyto(px, acc, casting="unsafe")
+    finally:
+        del rows
+    pygame.transform.scale(small, upscaled.get_size(), upscaled)
+    dest.blit(upscaled, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
@@ -1,76 +1,216 @@
 """
 WhitePager - Post Processing Pipeline
 CRT scanlines (scrolling), Bloom, Chromatic Aberration, Vignette.
+Scanlines and vignette are baked together into one overlay per scroll phase.
 """
+import os
+import numpy as np
 import pygame
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from src.constants import POST_BACKEND, POST_THREADS, OVERLAY_CACHE_DIR
+from src.core import post_kernels
+from src.core.profiler import FrameProfiler
+
+POST_BACKENDS = ("blend", "numpy")
+
+# Scanlines: 2 dark rows out of every SCANLINE_PERIOD, scrolling down the screen
+SCANLINE_PERIOD = 4
+SCANLINE_ALPHA = 70
+OVERLAY_VERSION = 1  # Bump when bake_overlay_alpha changes, to invalidate cached files
+
+def bake_overlay_alpha(w: int, h: int) -> np.ndarray:
+    """
+    Alpha planes for the black overlay blitted over every frame, shape
+    (SCANLINE_PERIOD + 1, h, w): the vignette alone, then the vignette combined
+    with the scanlines at each scroll phase. Vignette alpha grows with the
+    squared distance from the centre, reaching 255 in the corners.
+    """
+    ys = np.arange(h, dtype=np.float32) - h // 2
+    xs = np.arange(w, dtype=np.float32) - w // 2
+    max_dist_sq = float((w // 2)**2 + (h // 2)**2)
+    vignette = np.minimum(255.0, 255.0 / max_dist_sq * (ys[:, None]**2 + xs[None, :]**2))
+    # Stacked alpha layers: 255 - (255 - a)(255 - b) / 255
+    kept = (255.0 - vignette) / 255.0
+    planes = np.empty((SCANLINE_PERIOD + 1, h, w), dtype=np.uint8)
+    np.rint(vignette, out=planes[0], casting="unsafe")
+    rows = np.arange(h)
+    for phase in range(SCANLINE_PERIOD):
+        scan = np.where((rows + phase) % SCANLINE_PERIOD < 2, SCANLINE_ALPHA, 0).astype(np.float32)
+        np.rint(255.0 - kept * (255.0 - scan[:, None]), out=planes[phase + 1], casting="unsafe")
+    return planes
 
 class PostProcessor:
-    def __init__(self, w: int, h: int):
+    def __init__(self, w: int, h: int, profiler: FrameProfiler = None,
+                 backend: str = POST_BACKEND, threads: int = POST_THREADS,
+                 cache_dir: Optional[str] = OVERLAY_CACHE_DIR):
         self.w = w
         self.h = h
+        self.profiler = profiler or FrameProfiler()
+        self.backend = backend
+        self.threads = 1
+        self._pool: Optional[ThreadPoolExecutor] = None
         
-        # Internal surfaces for effects
-        self.bloom_surf = pygame.Surface((w // 4, h // 4))
-        self.vignette_surf = pygame.Surface((w, h), pygame.SRCALPHA)
+        self.cache_dir = cache_dir
+        
+        # Toggled by the quality governor
+        self.chromatic_aberration = True
+        self.scanlines = True
+        self.bloom_divisor = 4
         
         # Scrolling CRT scanlines
-        # Make scanline texture 2x height so we can scroll it
-        self.scanline_h = h * 2
-        self.scanline_surf = pygame.Surface((w, self.scanline_h), pygame.SRCALPHA)
         self.scanline_offset = 0.0
         
-        self._generate_scanlines()
-        self._generate_vignette()
-        
-    def _generate_scanlines(self):
-        """Pre-render CRT scanlines onto a tall transparent surface for scrolling."""
-        for y in range(0, self.scanline_h, 4):
-            pygame.draw.line(self.scanline_surf, (0, 0, 0, 70), (0, y), (self.w, y), 2)
-            
-    def _generate_vignette(self):
-        """Pre-render a dark radial gradient for the corners."""
-        center_x, center_y = self.w // 2, self.h // 2
-        max_dist = (center_x**2 + center_y**2)**0.5
+        self._allocate_targets()
+        self.set_backend(backend, threads)
         
-        for radius in range(int(max_dist), 0, -20):
-            alpha = int(min(255, 255 * (radius / max_dist)**2))
-            pygame.draw.circle(self.vignette_surf, (0, 0, 0, alpha), (center_x, center_y), radius, 20)
+    @staticmethod
+    def _make_target(size) -> pygame.Surface:
+        """Creates an opaque render target in the display pixel format when a display exists."""
+        surf = pygame.Surface(size)
+        if pygame.display.get_surface() is not None:
+            surf = surf.convert()
+        return surf
+
+    def set_backend(self, backend: str, threads: int = 1):
+        """Switches between the blend and numpy implementations; safe between frames."""
+        if backend not in POST_BACKENDS:
+            raise ValueError(f"Unknown post-processing backend: {backend}")
+        self.backend = backend
+        if threads != self.threads:
+            if self._pool is not None:
+                self._pool.shutdown()
+            self._pool = ThreadPoolExecutor(threads, thread_name_prefix="post") if threads > 1 else None
+            self.threads = threads
+
+    def _allocate_targets(self):
+        w, h = self.w, self.h
+        # Persistent render targets, written in place every frame
+        self.final_surf = self._make_target((w, h))
+        self.r_shift = self._make_target((w, h))
+        self.b_shift = self._make_target((w, h))
+        self.bloom_surf = self._make_target((w // self.bloom_divisor, h // self.bloom_divisor))
+        self.bloom_upscaled = self._make_target((w, h))
+        # Scanlines + vignette, one pre-baked overlay per scroll phase
+        self._bake_overlays()
+
+    def resize(self, w: int, h: int):
+        """
+        Reallocates the render targets and rebakes the overlays for a new size.
+        apply_effects calls it when handed a frame of another size.
+        """
+        if (w, h) == (self.w, self.h):
+            return
+        self.w, self.h = w, h
+        self.scanline_offset = 0.0
+        self._allocate_targets()
+
+    def apply_quality(self, tier):
+        """Adopts the post-processing settings of a QualityTier."""
+        self.chromatic_aberration = tier.chromatic_aberration
+        self.scanlines = tier.scanlines
+        if tier.bloom_divisor != self.bloom_divisor:
+            self.bloom_divisor = tier.bloom_divisor
+            self.bloom_surf = self._make_target((self.w // self.bloom_divisor, self.h // self.bloom_divisor))
+
+    def _overlay_cache_path(self) -> Optional[str]:
+        if self.cache_dir is None:
+            return None
+        return os.path.join(self.cache_dir, f"overlay_{self.w}x{self.h}_v{OVERLAY_VERSION}.npy")
+
+    def _load_overlay_alpha(self) -> np.ndarray:
+        """Baked alpha planes for the current size, from the disk cache when possible."""
+        shape = (SCANLINE_PERIOD + 1, self.h, self.w)
+        path = self._overlay_cache_path()
+        if path is not None and os.path.exists(path):
+            try:
+                planes = np.load(path)
+                if planes.shape == shape and planes.dtype == np.uint8:
+                    return planes
+            except (OSError, ValueError):
+                pass  # Unreadable or stale file: rebake and overwrite it
+        planes = bake_overlay_alpha(self.w, self.h)
+        if path is not None:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                tmp_path = path + ".tmp"
+                with open(tmp_path, "wb") as f:
+                    np.save(f, planes)
+                os.replace(tmp_path, path)
+            except OSError:
+                pass  # Read-only or sandboxed filesystem: just bake again next time
+        return planes
+
+    def _bake_overlays(self):
+        """
+        Black SRCALPHA overlays for every alpha plane (0 = vignette only, 1.. = scroll
+        phases). Done with the render targets, so apply_effects never touches disk.
+        """
+        planes = self._load_overlay_alpha()
+        rgba = np.zeros((self.h, self.w, 4), dtype=np.uint8)
+        self._overlays: List[pygame.Surface] = []
+        for plane in planes:
+            rgba[..., 3] = plane
+            surf = pygame.image.frombuffer(rgba, (self.w, self.h), "RGBA")
+            # frombuffer shares `rgba`; converting (or copying) gives each overlay its own pixels
+            self._overlays.append(surf.convert_alpha() if pygame.display.get_surface() is not None else surf.copy())
+
+    def _blend_bloom(self, screen: pygame.Surface, final_surf: pygame.Surface):
+        """Blend-path bloom: downscale, subtract a flat threshold, upscale and add."""
+        pygame.transform.scale(screen, self.bloom_surf.get_size(), self.bloom_surf)
+        self.bloom_surf.fill((150, 150, 150), special_flags=pygame.BLEND_RGB_SUB)
+        pygame.transform.scale(self.bloom_surf, (self.w, self.h), self.bloom_upscaled)
+        final_surf.blit(self.bloom_upscaled, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
 
     def apply_effects(self, screen: pygame.Surface, dt: float) -> pygame.Surface:
         """Applies Chromatic Aberration, Bloom, scrolling CRT, and Vignette."""
-        final_surf = screen.copy()
+        if screen.get_size() != (self.w, self.h):
+            self.resize(*screen.get_size())  # Window resized: rebake for the new size on first use
+        prof = self.profiler
+        final_surf = self.final_surf
+        numpy_backend = self.backend == "numpy"
         
         # 1. Chromatic Aberration
-        aberration_offset = 3
-        
-        r_shift = pygame.Surface((self.w, self.h))
-        r_shift.blit(screen, (aberration_offset, 0))
-        r_shift.fill((255, 100, 100), special_flags=pygame.BLEND_RGB_MULT)
-        
-        b_shift = pygame.Surface((self.w, self.h))
-        b_shift.blit(screen, (-aberration_offset, 0))
-        b_shift.fill((100, 100, 255), special_flags=pygame.BLEND_RGB_MULT)
-        
-        final_surf.fill((180, 200, 180), special_flags=pygame.BLEND_RGB_MULT)
-        final_surf.blit(r_shift, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
-        final_surf.blit(b_shift, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
+        with prof.section("post.aberration"):
+            if numpy_backend and self.chromatic_aberration:
+                # One weighted pass per pixel writes the whole of final_surf
+                post_kernels.chromatic_aberration(screen, final_surf, 3, self._pool, self.threads)
+            elif self.chromatic_aberration:
+                final_surf.blit(screen, (0, 0))
+                aberration_offset = 3
+
+                # The shifted copies leave a strip uncovered at one edge; clear just that strip
+                r_shift = self.r_shift
+                r_shift.fill((0, 0, 0), (0, 0, aberration_offset, self.h))
+                r_shift.blit(screen, (aberration_offset, 0))
+                r_shift.fill((255, 100, 100), special_flags=pygame.BLEND_RGB_MULT)
+
+                b_shift = self.b_shift
+                b_shift.fill((0, 0, 0), (self.w - aberration_offset, 0, aberration_offset, self.h))
+                b_shift.blit(screen, (-aberration_offset, 0))
+                b_shift.fill((100, 100, 255), special_flags=pygame.BLEND_RGB_MULT)
+
+                final_surf.fill((180, 200, 180), special_flags=pygame.BLEND_RGB_MULT)
+                final_surf.blit(r_shift, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
+                final_surf.blit(b_shift, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
+            else:
+                final_surf.blit(screen, (0, 0))
         
         # 2. Bloom
-        pygame.transform.scale(screen, (self.w // 4, self.h // 4), self.bloom_surf)
-        self.bloom_surf.fill((150, 150, 150), special_flags=pygame.BLEND_RGB_SUB)
-        bloom_upscaled = pygame.transform.scale(self.bloom_surf, (self.w, self.h))
-        final_surf.blit(bloom_upscaled, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
-        
-        # 3. Scrolling CRT Scanlines
-        self.scanline_offset += dt * 60.0  # scroll speed in px/sec
-        if self.scanline_offset >= self.h:
-            self.scanline_offset -= self.h
-            
-        y_off = int(self.scanline_offset)
-        # Blit the tall scanline texture shifted upward by the offset
-        final_surf.blit(self.scanline_surf, (0, -y_off))
+        with prof.section("post.bloom"):
+            if numpy_backend:
+                post_kernels.bloom(screen, self.bloom_surf, self.bloom_upscaled, final_surf)
+            else:
+                self._blend_bloom(screen, final_surf)
         
-        # 4. Vignette
-        final_surf.blit(self.vignette_surf, (0, 0), special_flags=pygame.BLEND_RGBA_SUB)
+        # 3. Scrolling CRT scanlines + vignette: one pre-baked overlay per scroll phase
+        with prof.section("post.overlay"):
+            self.scanline_offset += dt * 60.0  # scroll speed in px/sec
+            if self.scanline_offset >= self.h:
+                self.scanline_offset -= self.h
+
+            phase = int(self.scanline_offset) % SCANLINE_PERIOD + 1 if self.scanlines else 0
+            final_surf.blit(self._overlays[phase], (0, 0))
         
         return final_surf
@@ -0,0 +1,121 @@
+"""
+WhitePager - Asset Manifest and Preloader
+Every file the game touches is listed up front and decoded during a loading
+stage, so nothing is read from disk once the game loop is running.
+"""
+import asyncio
+import io
+import os
+import sys
+import pygame
+from typing import BinaryIO, Callable, Dict, List, Optional
+
+from src.core.assets import AssetManager
+from src.core.pack import AssetPack
+
+SRC_DIR = os.path.dirname(os.path.dirname(__file__))
+SFX_DIR = os.path.join(SRC_DIR, "SFX")
+# Built by `python -m src.core.pack`; entries it holds are loaded from it instead of the loose files
+ASSET_PACK_PATH = os.path.join(SRC_DIR, "assets.pak")
+
+# kind: "sound" (decoded pygame.mixer.Sound), "music" (raw bytes, streamed by
+# pygame.mixer.music) or "image" (decoded, then converted into AssetManager).
+# Images are pinned unless "pin": False; "atlas": True packs them into a shared sheet.
+ASSET_MANIFEST: List[dict] = [
+    {"kind": "sound", "name": "shoot", "path": os.path.join(SFX_DIR, "GunshotSFX.ogg")},
+    {"kind": "sound", "name": "hurt", "path": os.path.join(SFX_DIR, "HurtSfx.ogg")},
+    {"kind": "sound", "name": "revival", "path": os.path.join(SFX_DIR, "Revival.ogg")},
+    {"kind": "sound", "name": "underground_death", "path": os.path.join(SFX_DIR, "Underground death.ogg")},
+    {"kind": "music", "name": "music", "path": os.path.join(SFX_DIR, "Game Music.mp3")},
+]
+
+# progress(done, total, name)
+ProgressCallback = Callable[[int, int, str], None]
+
+
+def threads_available() -> bool:
+    """Background decoding needs real threads, which the pygbag (emscripten) build lacks."""
+    return sys.platform != "emscripten"
+
+
+class AssetPreloader:
+    """
+    Decodes a manifest, off the main thread where the platform allows. Entries
+    found (and up to date) in the asset pack at `pack_path` come from there;
+    pack_path=None always reads the loose files.
+    """
+    def __init__(self, manifest: List[dict] = ASSET_MANIFEST, pack_path: Optional[str] = ASSET_PACK_PATH):
+        self.manifest = manifest
+        self.pack: Optional[AssetPack] = None
+        if pack_path is not None and os.path.exists(pack_path):
+            try:
+                self.pack = AssetPack.open(pack_path)
+            except (OSError, ValueError) as e:
+                print(f"Ignoring asset pack {pack_path}: {e}")
+        self.from_pack = 0
+        self.sounds: Dict[str, pygame.mixer.Sound] = {}
+        self.music: Optional[BinaryIO] = None
+        self.loaded = 0
+        self.done = False
+        self._atlas_images: Dict[str, pygame.Surface] = {}
+
+    def _decode(self, entry: dict):
+        """Disk read + decode; safe to run on a worker thread."""
+        if self.pack is not None and self.pack.is_current(entry):
+            self.from_pack += 1
+            return self.pack.load(entry)
+        kind = entry["kind"]
+        if kind == "sound":
+            return pygame.mixer.Sound(entry["path"])
+        if kind == "music":
+            with open(entry["path"], "rb") as f:
+                return io.BytesIO(f.read())
+        if kind == "image":
+            return pygame.image.load(entry["path"])
+        raise ValueError(f"Unknown asset kind: {kind}")
+
+    def _store(self, entry: dict, asset):
+        """Main-thread half: display conversion and registration."""
+        kind = entry["kind"]
+        if kind == "sound":
+            self.sounds[entry["name"]] = asset
+        elif kind == "music":
+            self.music = asset
+        elif entry.get("atlas"):
+            self._atlas_images[entry["path"]] = asset
+        else:
+            AssetManager.store_image(entry["path"], asset, pin=entry.get("pin", True))
+        self.loaded += 1
+
+    def _finish(self):
+        if self._atlas_images:
+            AssetManager.build_atlas(self._atlas_images)
+            self._atlas_images = {}
+        self.done = True
+
+    def _prepare(self):
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+
+    async def load(self, progress: Optional[ProgressCallback] = None):
+        """Loads every manifest entry, yielding to the event loop between entries."""
+        self._prepare()
+        total = len(self.manifest)
+        use_threads = threads_available()
+        for entry in self.manifest:
+            if use_threads:
+                asset = await asyncio.to_thread(self._decode, entry)
+            else:
+                asset = self._decode(entry)
+            self._store(entry, asset)
+            if progress is not None:
+                progress(self.loaded, total, entry["name"])
+            await asyncio.sleep(0)
+        self._finish()
+
+    def load_blocking(self):
+        """Synchronous variant for headless runs and tools."""
+        self._prepare()
+        for entry in self.manifest:
+            self._store(entry, self._decode(entry))
+        self._finish()
@@ -0,0 +1,195 @@
+"""
+WhitePager - Frame Profiler
+Scoped section timings with rolling statistics, an on-screen overlay and
+Chrome trace-event export (load the JSON in chrome://tracing or Perfetto).
+"""
+import json
+import threading
+import time
+import pygame
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, List, Optional, Tuple
+
+from src.constants import PROFILER_HISTORY
+
+OVERLAY_REFRESH_FRAMES: int = 15  # Overlay text is re-rendered this often, not every frame
+
+
+class _NullSection:
+    """Shared no-op context returned while profiling is disabled."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SECTION = _NullSection()
+
+
+class _Section:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: "FrameProfiler", name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler._record(self.name, self.start, time.perf_counter_ns())
+        return False
+
+
+# (name, start ns, end ns, trace thread id)
+SectionRecord = Tuple[str, int, int, int]
+
+
+class FrameProfiler:
+    """
+    `with profiler.section("name"):` times a block. Disabled (the default) it
+    returns a shared no-op context, so instrumentation costs one call per section.
+    Other threads record into a buffer of their own (capture()), which the main
+    thread merge()s into the frame it is on; only the main thread touches the
+    current frame.
+    """
+    def __init__(self, history: int = PROFILER_HISTORY):
+        self.enabled = False
+        self.history = history
+        self._frames: Deque[List[SectionRecord]] = deque(maxlen=history)
+        self._current: Optional[List[SectionRecord]] = None
+        self._tids: Dict[int, int] = {}  # Thread ident -> small trace tid, main thread first
+        self._capture = threading.local()  # .sections: buffer for the thread's records, if capturing
+        # Per section: total ms in each of the last `history` frames
+        self._samples: Dict[str, Deque[float]] = {}
+        self._frame_totals: Dict[str, float] = {}
+        self._frame_count = 0
+
+        self._overlay: Optional[pygame.Surface] = None
+        self._font: Optional[pygame.font.Font] = None
+
+    def section(self, name: str):
+        if not self.enabled:
+            return _NULL_SECTION
+        return _Section(self, name)
+
+    def _tid(self) -> int:
+        ident = threading.get_ident()
+        tid = self._tids.get(ident)
+        if tid is None:
+            tid = self._tids.setdefault(ident, len(self._tids))
+        return tid
+
+    def _record(self, name: str, start: int, end: int):
+        sections = getattr(self._capture, "sections", None)
+        if sections is not None:
+            sections.append((name, start, end, self._tid()))
+            return
+        current = self._current
+        if current is not None:
+            current.append((name, start, end, self._tid()))
+        self._frame_totals[name] = self._frame_totals.get(name, 0.0) + (end - start) / 1e6
+
+    @contextmanager
+    def capture(self, sections: List[SectionRecord]):
+        """Sends this thread's section records to `sections` instead of the current frame."""
+        self._capture.sections = sections
+        try:
+            yield sections
+        finally:
+            self._capture.sections = None
+
+    def merge(self, sections: List[SectionRecord]):
+        """Adds records captured on another thread to the current frame (main thread only)."""
+        current = self._current
+        if not self.enabled or current is None:
+            return
+        current.extend(sections)
+        totals = self._frame_totals
+        for name, start, end, _ in sections:
+            totals[name] = totals.get(name, 0.0) + (end - start) / 1e6
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self._current = []
+        self._frame_totals = {}
+
+    def end_frame(self):
+        if not self.enabled or self._current is None:
+            return
+        self._frames.append(self._current)
+        for name, total in self._frame_totals.items():
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.history)
+            samples.append(total)
+        self._current = None
+        self._frame_count += 1
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self._current = None
+        self._overlay = None
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Rolling min/avg/p95/p99 in ms per section over the last `history` frames."""
+        result = {}
+        for name, samples in self._samples.items():
+            if not samples:
+                continue
+            ordered = sorted(samples)
+            n = len(ordered)
+            result[name] = {
+                "min": ordered[0],
+                "avg": sum(ordered) / n,
+                "p95": ordered[min(n - 1, int(n * 0.95))],
+                "p99": ordered[min(n - 1, int(n * 0.99))],
+            }
+        return result
+
+    def export_chrome_trace(self, path: str, frames: Optional[int] = None) -> int:
+        """Writes the last `frames` recorded frames as trace-event JSON. Returns the event count."""
+        recorded = list(self._frames)
+        if frames is not None:
+            recorded = recorded[-frames:]
+        events = []
+        for index, frame in enumerate(recorded):
+            for name, start, end, tid in frame:
+                events.append({
+                    "name": name, "cat": "frame", "ph": "X", "pid": 0, "tid": tid,
+                    "ts": start / 1000.0, "dur": (end - start) / 1000.0,
+                    "args": {"frame": self._frame_count - len(recorded) + index},
+                })
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return len(events)
+
+    def draw_overlay(self, screen: pygame.Surface, pos: Tuple[int, int] = (20, 60)):
+        if not self.enabled:
+            return
+        if self._overlay is None or self._frame_count % OVERLAY_REFRESH_FRAMES == 0:
+            self._overlay = self._render_overlay()
+        screen.blit(self._overlay, pos)
+
+    def _render_overlay(self) -> pygame.Surface:
+        if self._font is None:
+            self._font = pygame.font.SysFont(None, 20)
+        lines = [f"{'section':<18}{'min':>7}{'avg':>7}{'p95':>7}{'p99':>7}  ms"]
+        for name, s in self.stats().items():
+            lines.append(f"{name:<18}{s['min']:>7.2f}{s['avg']:>7.2f}{s['p95']:>7.2f}{s['p99']:>7.2f}")
+        rendered = [self._font.render(line, True, (220, 220, 220)) for line in lines]
+        height = sum(r.get_height() for r in rendered) + 8
+        width = max(r.get_width() for r in rendered) + 8
+        overlay = pygame.Surface((width, height), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 170))
+        y = 4
+        for r in rendered:
+            overlay.blit(r, (4, y))
+            y += r.get_height()
+        return overlay
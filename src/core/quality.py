@@ -0,0 +1,103 @@
+"""
+WhitePager - Adaptive Quality Governor
+Steps the render pipeline through quality tiers based on measured frame time.
+"""
+from collections import deque
+from typing import Callable, Deque, List, Tuple
+
+from src.constants import FPS, MAX_PARTICLES
+
+
+class QualityTier:
+    """A named bundle of render settings, from most to least expensive."""
+    def __init__(self, name: str, chromatic_aberration: bool = True, bloom_divisor: int = 4,
+                 scanlines: bool = True, max_particles: int = MAX_PARTICLES, zoom: bool = True):
+        self.name = name
+        self.chromatic_aberration = chromatic_aberration
+        self.bloom_divisor = bloom_divisor  # Bloom buffer is (w / divisor, h / divisor)
+        self.scanlines = scanlines
+        self.max_particles = max_particles
+        self.zoom = zoom
+
+    def __repr__(self) -> str:
+        return f"QualityTier({self.name!r})"
+
+
+# Each tier drops one more effect than the tier before it
+QUALITY_TIERS: List[QualityTier] = [
+    QualityTier("high"),
+    QualityTier("medium", chromatic_aberration=False),
+    QualityTier("low", chromatic_aberration=False, bloom_divisor=8),
+    QualityTier("lower", chromatic_aberration=False, bloom_divisor=8, scanlines=False, max_particles=4000),
+    QualityTier("minimal", chromatic_aberration=False, bloom_divisor=8, scanlines=False, max_particles=1000, zoom=False),
+]
+
+
+class QualityGovernor:
+    """
+    Tracks a rolling frame-time percentile and moves between QUALITY_TIERS.
+    Hysteresis: a downgrade needs the percentile above `budget_ms * downgrade_ratio`,
+    an upgrade needs it below `budget_ms * upgrade_ratio`, and after any change the
+    window is refilled from scratch before the next decision.
+    """
+    def __init__(self, budget_ms: float = 1000.0 / FPS, window: int = 90, percentile: float = 0.9,
+                 downgrade_ratio: float = 1.05, upgrade_ratio: float = 0.7,
+                 tiers: List[QualityTier] = QUALITY_TIERS):
+        self.budget_ms = budget_ms
+        self.percentile = percentile
+        self.downgrade_ratio = downgrade_ratio
+        self.upgrade_ratio = upgrade_ratio
+        self.tiers = tiers
+        self.tier_index = 0
+        self.enabled = True
+
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._frame = 0
+
+        # (frame, old tier name, new tier name, measured percentile in ms)
+        self.changes: List[Tuple[int, str, str, float]] = []
+        self._listeners: List[Callable[[QualityTier, QualityTier, float], None]] = []
+
+    @property
+    def tier(self) -> QualityTier:
+        return self.tiers[self.tier_index]
+
+    def add_listener(self, callback: Callable[[QualityTier, QualityTier, float], None]):
+        """Registers callback(old_tier, new_tier, percentile_ms), called on every tier change."""
+        self._listeners.append(callback)
+
+    def frame_time_percentile(self) -> float:
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * self.percentile))]
+
+    def record(self, frame_ms: float) -> bool:
+        """Feeds one measured frame time. Returns True if the tier changed."""
+        self._frame += 1
+        if not self.enabled:
+            return False
+        self._samples.append(frame_ms)
+        if len(self._samples) < self._samples.maxlen:
+            return False
+
+        p = self.frame_time_percentile()
+        if p > self.budget_ms * self.downgrade_ratio and self.tier_index < len(self.tiers) - 1:
+            self.set_tier(self.tier_index + 1, p)
+            return True
+        if p < self.budget_ms * self.upgrade_ratio and self.tier_index > 0:
+            self.set_tier(self.tier_index - 1, p)
+            return True
+        return False
+
+    def set_tier(self, index: int, percentile_ms: float = 0.0):
+        """Forces a tier, notifying listeners and restarting the measurement window."""
+        index = max(0, min(len(self.tiers) - 1, index))
+        old = self.tier
+        self.tier_index = index
+        self._samples.clear()
+        if old is self.tier:
+            return
+        self.changes.append((self._frame, old.name, self.tier.name, percentile_ms))
+        for callback in self._listeners:
+            callback(old, self.tier, percentile_ms)
@@ -0,0 +1,224 @@
+"""
+WhitePager - Input Recording and Replay
+Captures every frame's inputs into a compact binary file and feeds them back
+into the engine, so a real play session becomes a repeatable benchmark workload.
+"""
+import struct
+import zlib
+import pygame
+from typing import List, NamedTuple, Optional, Tuple
+
+from src.constants import SIM_DT
+from src.core.input import KeyState
+
+REPLAY_MAGIC = b"WPRP"
+REPLAY_VERSION = 1
+
+# Held keys Player reads, one bit each in this order
+RECORDED_KEYS: Tuple[int, ...] = (pygame.K_a, pygame.K_d, pygame.K_w, pygame.K_s, pygame.K_SPACE)
+# Single-press events handle_events reacts to, stored as an index into this table
+RECORDED_EVENTS: Tuple[Tuple[int, Optional[str], Optional[int]], ...] = (
+    (pygame.QUIT, None, None),
+    (pygame.KEYDOWN, "key", pygame.K_ESCAPE),
+    (pygame.KEYDOWN, "key", pygame.K_k),
+    (pygame.KEYDOWN, "key", pygame.K_LSHIFT),
+    (pygame.KEYDOWN, "key", pygame.K_o),
+    (pygame.MOUSEBUTTONDOWN, "button", 3),
+)
+
+# magic, version, seed, sim dt, frame count, final state digest
+_HEADER = struct.Struct("<4sBQdI8s")
+
+
+class ReplayFrame(NamedTuple):
+    dt: float                 # Real frame time (drives post-processing animation only)
+    steps: int                # Simulation ticks run this frame
+    keys: int                 # RECORDED_KEYS bitmask
+    buttons: int              # Mouse button bitmask (left, middle, right)
+    mouse: Tuple[int, int]
+    events: Tuple[int, ...]   # Indices into RECORDED_EVENTS, in arrival order
+
+
+def _write_varint(out: bytearray, value: int):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def _zigzag(value: int) -> int:
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def _unzigzag(value: int) -> int:
+    return value >> 1 if not value & 1 else -(value >> 1) - 1
+
+
+def _event_code(event: pygame.event.Event) -> Optional[int]:
+    for code, (etype, attr, value) in enumerate(RECORDED_EVENTS):
+        if event.type == etype and (attr is None or getattr(event, attr, None) == value):
+            return code
+    return None
+
+
+class Replay:
+    """
+    A recorded session: the seed, the tick length and one ReplayFrame per
+    rendered frame. On disk each frame is one byte of key + button bits, the
+    tick count, dt in microseconds and the mouse delta as varints, then the
+    event codes; the body is zlib-compressed, so an idle minute is a few hundred bytes.
+    """
+    def __init__(self, seed: int, sim_dt: float = SIM_DT, frames: List[ReplayFrame] = None, digest: str = ""):
+        self.seed = seed
+        self.sim_dt = sim_dt
+        self.frames: List[ReplayFrame] = frames if frames is not None else []
+        self.digest = digest  # GameEngine.state_digest() after the last frame
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    def encode(self) -> bytes:
+        body = bytearray()
+        last_x = last_y = 0
+        for frame in self.frames:
+            body.append(frame.keys | frame.buttons << len(RECORDED_KEYS))
+            body.append(frame.steps)
+            _write_varint(body, round(frame.dt * 1e6))
+            x, y = frame.mouse
+            _write_varint(body, _zigzag(x - last_x))
+            _write_varint(body, _zigzag(y - last_y))
+            last_x, last_y = x, y
+            body.append(len(frame.events))
+            body.extend(frame.events)
+        header = _HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.seed, self.sim_dt, len(self.frames),
+                              bytes.fromhex(self.digest or "00" * 8))
+        return header + zlib.compress(bytes(body), 9)
+
+    @classmethod
+    def decode(cls, data: bytes) -> "Replay":
+        magic, version, seed, sim_dt, count, digest = _HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+            raise ValueError(f"Not a version {REPLAY_VERSION} replay file")
+        body = zlib.decompress(data[_HEADER.size:])
+        frames = []
+        pos = 0
+        x = y = 0
+        key_mask = (1 << len(RECORDED_KEYS)) - 1
+        for _ in range(count):
+            bits = body[pos]
+            steps = body[pos + 1]
+            dt_us, pos = _read_varint(body, pos + 2)
+            dx, pos = _read_varint(body, pos)
+            dy, pos = _read_varint(body, pos)
+            x += _unzigzag(dx)
+            y += _unzigzag(dy)
+            n = body[pos]
+            events = tuple(body[pos + 1:pos + 1 + n])
+            pos += 1 + n
+            frames.append(ReplayFrame(dt_us / 1e6, steps, bits & key_mask, bits >> len(RECORDED_KEYS), (x, y), events))
+        return cls(seed, sim_dt, frames, digest.hex())
+
+    def save(self, path: str) -> int:
+        """Writes the replay file. Returns its size in bytes."""
+        data = self.encode()
+        with open(path, "wb") as f:
+            f.write(data)
+        return len(data)
+
+    @classmethod
+    def load(cls, path: str) -> "Replay":
+        with open(path, "rb") as f:
+            return cls.decode(f.read())
+
+
+class InputRecorder:
+    """Input source wrapper that passes `source` through and logs what the engine saw each frame."""
+    def __init__(self, source, seed: int, sim_dt: float = SIM_DT):
+        self.source = source
+        self.replay = Replay(seed, sim_dt)
+        self._events: List[int] = []
+
+    def begin_frame(self, engine):
+        self.source.begin_frame(engine)
+        self._events = []
+
+    def get_events(self) -> List[pygame.event.Event]:
+        events = self.source.get_events()
+        for event in events:
+            code = _event_code(event)
+            if code is not None:
+                self._events.append(code)
+        return events
+
+    def get_pressed(self):
+        return self.source.get_pressed()
+
+    def get_mouse_pressed(self) -> Tuple[bool, bool, bool]:
+        return self.source.get_mouse_pressed()
+
+    def get_mouse_pos(self) -> Tuple[int, int]:
+        return self.source.get_mouse_pos()
+
+    def end_frame(self, dt: float, steps: int):
+        """Logs the frame once its `steps` simulation ticks have run."""
+        held = self.source.get_pressed()
+        keys = 0
+        for bit, key in enumerate(RECORDED_KEYS):
+            if held[key]:
+                keys |= 1 << bit
+        buttons = 0
+        for bit, pressed in enumerate(self.source.get_mouse_pressed()[:3]):
+            if pressed:
+                buttons |= 1 << bit
+        mx, my = self.source.get_mouse_pos()
+        self.replay.frames.append(ReplayFrame(dt, steps, keys, buttons, (int(mx), int(my)), tuple(self._events)))
+        self._events = []
+
+
+class ReplayInput:
+    """Input source that plays a Replay back, one recorded frame per begin_frame()."""
+    def __init__(self, replay: Replay):
+        self.replay = replay
+        self.index = -1
+        self.frame: Optional[ReplayFrame] = None
+        self.keys = KeyState()
+
+    @property
+    def remaining(self) -> int:
+        return len(self.replay.frames) - self.index - 1
+
+    def begin_frame(self, engine):
+        self.index += 1
+        self.frame = self.replay.frames[self.index]
+        self.keys = KeyState(key for bit, key in enumerate(RECORDED_KEYS) if self.frame.keys & (1 << bit))
+
+    def get_events(self) -> List[pygame.event.Event]:
+        pygame.event.pump()
+        if self.frame is None:  # Loading screen, before the first recorded frame
+            return []
+        events = []
+        for code in self.frame.events:
+            etype, attr, value = RECORDED_EVENTS[code]
+            events.append(pygame.event.Event(etype, {attr: value} if attr else {}))
+        return events
+
+    def get_pressed(self) -> KeyState:
+        return self.keys
+
+    def get_mouse_pressed(self) -> Tuple[bool, bool, bool]:
+        buttons = self.frame.buttons
+        return bool(buttons & 1), bool(buttons & 2), bool(buttons & 4)
+
+    def get_mouse_pos(self) -> Tuple[int, int]:
+        return self.frame.mouse
@@ -0,0 +1,63 @@
+"""
+WhitePager - Entity Streaming Window
+Keeps simulation cost bounded in an infinite world: entities far from the
+player are despawned and each entity type has a hard live budget.
+"""
+import pygame
+from typing import Dict
+
+from src.constants import STREAM_RADIUS, ENTITY_BUDGETS
+
+
+class StreamingWindow:
+    """A window of +/- `radius` px around the player's x, plus per-type live budgets."""
+    def __init__(self, radius: float = STREAM_RADIUS, budgets: Dict[str, int] = None):
+        self.radius = radius
+        self.budgets = dict(ENTITY_BUDGETS if budgets is None else budgets)
+        self.center_x = 0.0
+
+        # Stats
+        self.despawned: Dict[str, int] = {kind: 0 for kind in self.budgets}
+        self.spawns_denied: Dict[str, int] = {kind: 0 for kind in self.budgets}
+
+    def recenter(self, x: float):
+        self.center_x = x
+
+    def contains(self, x: float) -> bool:
+        return abs(x - self.center_x) <= self.radius
+
+    def cull(self, kind: str, group: pygame.sprite.Group) -> int:
+        """Kills every sprite of `group` outside the window. Returns how many were removed."""
+        lo = self.center_x - self.radius
+        hi = self.center_x + self.radius
+        removed = 0
+        for sprite in group:
+            if not lo <= sprite.rect.centerx <= hi:
+                sprite.kill()
+                removed += 1
+        self.despawned[kind] = self.despawned.get(kind, 0) + removed
+        return removed
+
+    def cull_buffer(self, kind: str, buffer) -> int:
+        """Like cull() for an array-backed store exposing cull(lo, hi), e.g. ProjectileBuffer."""
+        removed = buffer.cull(self.center_x - self.radius, self.center_x + self.radius)
+        self.despawned[kind] = self.despawned.get(kind, 0) + removed
+        return removed
+
+    def has_room(self, kind: str, live: int) -> bool:
+        """True if one more entity of `kind` fits the budget; counts a denial otherwise."""
+        if live < self.budgets.get(kind, live + 1):
+            return True
+        self.spawns_denied[kind] = self.spawns_denied.get(kind, 0) + 1
+        return False
+
+    def spawn_interval_scale(self, kind: str, live: int) -> float:
+        """
+        Multiplier for a spawn interval: 1.0 up to half the budget, then rising
+        linearly to 3.0 at the budget so spawning eases off before the hard cap.
+        """
+        budget = self.budgets.get(kind)
+        if not budget:
+            return 1.0
+        fill = live / budget
+        return 1.0 if fill <= 0.5 else 1.0 + 4.0 * (min(fill, 1.0) - 0.5)
@@ -0,0 +1,170 @@
+"""
+WhitePager - Vectorized Swarm Simulation
+Moves every BaseEnemy / Echo in one NumPy step per tick instead of one Python
+update() call per sprite. The sprites stay the handles the rest of the engine
+uses (groups, collisions, drawing); only their movement lives here.
+"""
+import numpy as np
+from typing import List, Optional
+
+from src.constants import SURFACE_Y, G_SURFACE
+
+
+class Swarm:
+    """
+    Growable structure-of-arrays store of sprite motion. Attached sprites occupy
+    the first `count` slots (sprite.slot) and are swap-removed on detach. While a
+    sprite is attached the arrays are authoritative; its pos_x/pos_y/velocity_x/
+    velocity_y attributes are written back when it detaches.
+    """
+    def __init__(self, capacity: int = 64, seed: Optional[int] = None):
+        self.capacity = capacity
+        self.count = 0
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.half_h = np.zeros(capacity)
+        # Integer rect centers last written to the sprites
+        self.rect_x = np.zeros(capacity, dtype=np.int64)
+        self.rect_y = np.zeros(capacity, dtype=np.int64)
+        self.sprites: List = []
+        self.rng = np.random.default_rng(seed)
+
+        # Stats
+        self.rects_synced = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _field_names(self):
+        return ("x", "y", "vx", "vy", "half_h", "rect_x", "rect_y")
+
+    def _grow(self):
+        self.capacity *= 2
+        for name in self._field_names():
+            old = getattr(self, name)
+            new = np.zeros(self.capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def add(self, sprite):
+        if self.count == self.capacity:
+            self._grow()
+        i = self.count
+        self.x[i] = sprite.pos_x
+        self.y[i] = sprite.pos_y
+        self.vx[i] = sprite.velocity_x
+        self.vy[i] = sprite.velocity_y
+        self.half_h[i] = sprite.rect.height / 2
+        self.rect_x[i], self.rect_y[i] = sprite.rect.center
+        self._add_extra(i, sprite)
+        self.sprites.append(sprite)
+        sprite.slot = i
+        self.count += 1
+
+    def _add_extra(self, i: int, sprite):
+        pass
+
+    def remove(self, sprite):
+        """Detaches `sprite`, writing its motion back. Safe to call more than once."""
+        i = sprite.slot
+        if i < 0 or i >= self.count or self.sprites[i] is not sprite:
+            return
+        sprite.pos_x = float(self.x[i])
+        sprite.pos_y = float(self.y[i])
+        sprite.velocity_x = float(self.vx[i])
+        sprite.velocity_y = float(self.vy[i])
+        last = self.count - 1
+        if i != last:
+            for name in self._field_names():
+                field = getattr(self, name)
+                field[i] = field[last]
+            moved = self.sprites[last]
+            self.sprites[i] = moved
+            moved.slot = i
+        self.sprites.pop()
+        self.count = last
+        sprite.slot = -1
+
+    def _sync_rects(self):
+        """Writes rect centers back only for sprites whose integer position changed."""
+        n = self.count
+        ix = self.x[:n].astype(np.int64)
+        iy = self.y[:n].astype(np.int64)
+        moved = np.flatnonzero((ix != self.rect_x[:n]) | (iy != self.rect_y[:n]))
+        if not len(moved):
+            return
+        sprites = self.sprites
+        for i, cx, cy in zip(moved.tolist(), ix[moved].tolist(), iy[moved].tolist()):
+            sprites[i].rect.center = (cx, cy)
+        self.rect_x[:n] = ix
+        self.rect_y[:n] = iy
+        self.rects_synced += len(moved)
+
+
+class EnemySwarm(Swarm):
+    """BaseEnemy movement: random hops, Surface gravity, landing on the surface line."""
+    def step(self, dt: float):
+        n = self.count
+        if not n:
+            return
+        x, y, vx, vy, hh = self.x[:n], self.y[:n], self.vx[:n], self.vy[:n], self.half_h[:n]
+
+        # AI: chance to jump randomly if grounded
+        jump = (self.rng.random(n) < 0.01 * dt * 60) & (y + hh >= SURFACE_Y - 5)
+        vy[jump] = -400.0
+
+        # Gravity
+        vy += G_SURFACE * dt
+        y += vy * dt
+        x += vx * dt
+
+        # Surface collision
+        grounded = y + hh >= SURFACE_Y
+        y[grounded] = SURFACE_Y - hh[grounded]
+        vy[grounded] = 0.0
+        self._sync_rects()
+
+
+class EchoSwarm(Swarm):
+    """Echo movement: chase the player along x, teleport back when left behind, walk the ceiling."""
+    def __init__(self, capacity: int = 64, seed: Optional[int] = None):
+        self.speed = np.zeros(capacity)
+        super().__init__(capacity, seed)
+
+    def _field_names(self):
+        return super()._field_names() + ("speed",)
+
+    def _add_extra(self, i: int, sprite):
+        self.speed[i] = sprite.chase_speed
+
+    def step(self, dt: float, player_x: float):
+        n = self.count
+        if not n:
+            return
+        x, y, vx, vy, hh = self.x[:n], self.y[:n], self.vx[:n], self.vy[:n], self.half_h[:n]
+
+        # AI: Chase player on X axis
+        speed = self.speed[:n]
+        np.copyto(vx, np.where(player_x < x, -speed, speed))
+
+        # AI: Teleport closer if player is running away (too far)
+        far = np.flatnonzero(np.abs(x - player_x) > 1200)
+        if len(far):
+            x[far] = player_x + np.where(self.rng.random(len(far)) < 0.5, -500.0, 500.0)
+
+        # AI: Chance to jump from the ceiling (inverted gravity)
+        jump = (self.rng.random(n) < 0.01 * dt * 60) & (y - hh <= SURFACE_Y + 5)
+        vy[jump] = 400.0
+
+        # Physics - Walk on Ceiling
+        vy -= G_SURFACE * dt
+        y += vy * dt
+        x += vx * dt
+
+        # Stick to the surface line from below
+        stuck = y - hh <= SURFACE_Y
+        y[stuck] = SURFACE_Y + hh[stuck]
+        vy[stuck] = 0.0
+        self._sync_rects()
@@ -4,70 +4,164 @@ WhitePager - Vfx / "Juice" Systems
 import pygame
 import random
 import math
-from typing import List, Tuple
-
-from src.constants import SCREEN_WIDTH, SCREEN_HEIGHT
-
-class Particle:
-    def __init__(self, x: float, y: float, vx: float, vy: float, color: Tuple[int, int, int], lifetime: float, size: float):
-        self.x = x
-        self.y = y
-        self.vx = vx
-        self.vy = vy
-        self.color = color
-        self.lifetime = lifetime
-        self.max_lifetime = lifetime
-        self.size = size
-
-    def update(self, dt: float) -> bool:
-        """Returns False if particle should die."""
-        self.x += self.vx * dt
-        self.y += self.vy * dt
-        self.lifetime -= dt
-        return self.lifetime > 0
-
-    def draw(self, surface: pygame.Surface, offset_x: int = 0, offset_y: int = 0):
-        # Scale based on lifetime
-        current_size = max(1, int(self.size * (self.lifetime / self.max_lifetime)))
-        pygame.draw.rect(surface, self.color, (int(self.x) + offset_x, int(self.y) + offset_y, current_size, current_size))
+import numpy as np
+from itertools import repeat
+from typing import Dict, Optional, Tuple
+
+from src.constants import SCREEN_WIDTH, SCREEN_HEIGHT, MAX_PARTICLES, PARTICLE_GLOW
+from src.core.assets import AssetManager
 
+# Additive glow stamps: a soft disc GLOW_SCALE times the particle size, peaking at GLOW_STRENGTH of its color
+GLOW_SCALE = 3
+GLOW_STRENGTH = 0.6
 
 class ParticleSystem:
-    def __init__(self):
-        self.particles: List[Particle] = []
+    """
+    Fixed-capacity structure-of-arrays particle store.
+    Every particle attribute lives in a preallocated NumPy array; live particles
+    occupy the first `count` slots and dead ones are swap-removed each update.
+    """
+    def __init__(self, capacity: int = MAX_PARTICLES, seed: Optional[int] = None):
+        self.capacity = capacity
+        self.count = 0
+        self.max_live = capacity  # Emission cap, lowered by the quality governor
+
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.lifetime = np.zeros(capacity, dtype=np.float32)
+        self.max_lifetime = np.ones(capacity, dtype=np.float32)
+        self.size = np.zeros(capacity, dtype=np.float32)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self._fields = (self.pos, self.vel, self.lifetime, self.max_lifetime, self.size, self.color)
+
+        self.rng = np.random.default_rng(seed)
+        self.glow = PARTICLE_GLOW
+        self._glow_stamps: Dict[Tuple[Tuple[int, int, int], int], pygame.Surface] = {}
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _emit(self, x: np.ndarray, y: np.ndarray, vx: np.ndarray, vy: np.ndarray,
+              color: Tuple[int, int, int], lifetime: np.ndarray, size: np.ndarray):
+        """Appends a batch of particles, dropping whatever does not fit in the store."""
+        n = min(len(lifetime), min(self.capacity, self.max_live) - self.count)
+        if n <= 0:
+            return
+        s = slice(self.count, self.count + n)
+        self.pos[s, 0] = x[:n]
+        self.pos[s, 1] = y[:n]
+        self.vel[s, 0] = vx[:n]
+        self.vel[s, 1] = vy[:n]
+        self.lifetime[s] = lifetime[:n]
+        self.max_lifetime[s] = lifetime[:n]
+        self.size[s] = size[:n]
+        self.color[s] = color
+        self.count += n
 
     def emit_explosion(self, x: float, y: float, color: Tuple[int, int, int], count: int = 30):
-        for _ in range(count):
-            angle = random.uniform(0, math.pi * 2)
-            speed = random.uniform(50, 300)
-            vx = math.cos(angle) * speed
-            vy = math.sin(angle) * speed
-            lifetime = random.uniform(0.2, 0.8)
-            size = random.uniform(2, 6)
-            self.particles.append(Particle(x, y, vx, vy, color, lifetime, size))
+        angle = self.rng.uniform(0, math.pi * 2, count)
+        speed = self.rng.uniform(50, 300, count)
+        lifetime = self.rng.uniform(0.2, 0.8, count)
+        size = self.rng.uniform(2, 6, count)
+        self._emit(np.full(count, x), np.full(count, y),
+                   np.cos(angle) * speed, np.sin(angle) * speed,
+                   color, lifetime, size)
             
     def emit_shatter(self, y_level: float, color: Tuple[int, int, int]):
         """Spanws a line of particles across the screen to simulate glass shattering."""
-        for _ in range(150):
-            x = random.uniform(0, SCREEN_WIDTH)
-            y = y_level + random.uniform(-10, 10)
-            vx = random.uniform(-50, 50)
-            vy = random.uniform(50, 500) # Mostly fall down
-            lifetime = random.uniform(0.5, 1.5)
-            size = random.uniform(3, 8)
-            self.particles.append(Particle(x, y, vx, vy, color, lifetime, size))
+        count = 150
+        x = self.rng.uniform(0, SCREEN_WIDTH, count)
+        y = y_level + self.rng.uniform(-10, 10, count)
+        vx = self.rng.uniform(-50, 50, count)
+        vy = self.rng.uniform(50, 500, count) # Mostly fall down
+        lifetime = self.rng.uniform(0.5, 1.5, count)
+        size = self.rng.uniform(3, 8, count)
+        self._emit(x, y, vx, vy, color, lifetime, size)
 
     def update(self, dt: float):
-        self.particles = [p for p in self.particles if p.update(dt)]
-
-    def draw(self, surface: pygame.Surface, offset_x: int = 0, offset_y: int = 0):
-        for p in self.particles:
-            p.draw(surface, offset_x, offset_y)
+        n = self.count
+        if n == 0:
+            return
+        self.pos[:n] += self.vel[:n] * dt
+        self.lifetime[:n] -= dt
+
+        # Swap-remove: dead slots inside the surviving prefix are refilled from
+        # live particles beyond it, so only the minimum number of rows move.
+        live = self.lifetime[:n] > 0
+        k = int(np.count_nonzero(live))
+        if k < n:
+            holes = np.flatnonzero(~live[:k])
+            movers = np.flatnonzero(live[k:]) + k
+            for field in self._fields:
+                field[holes] = field[movers]
+            self.count = k
+
+    def _glow_stamp(self, color: Tuple[int, int, int], size: int) -> pygame.Surface:
+        """Prebaked soft disc for BLEND_RGB_ADD, centred on a `size` px particle."""
+        key = (color, size)
+        stamp = self._glow_stamps.get(key)
+        if stamp is None:
+            dim = size * GLOW_SCALE
+            r = np.arange(dim, dtype=np.float32) - (dim - 1) / 2
+            dist = np.sqrt(r[:, None]**2 + r[None, :]**2) / (dim / 2)
+            falloff = np.clip(1.0 - dist, 0.0, 1.0)**2 * GLOW_STRENGTH
+            rgb = (falloff[..., None] * np.array(color, dtype=np.float32)).astype(np.uint8)
+            stamp = pygame.image.frombuffer(rgb.tobytes(), (dim, dim), "RGB")
+            if pygame.display.get_surface() is not None:
+                stamp = stamp.convert()
+            self._glow_stamps[key] = stamp
+        return stamp
+
+    def draw(self, surface: pygame.Surface, offset_x: int = 0, offset_y: int = 0, scale: float = 1.0,
+             view: Optional[pygame.Rect] = None) -> int:
+        """
+        Draws particles at (pos + offset) * scale; scale maps world px to `surface` px.
+        Particles outside `view` (default: the whole surface) are culled, the rest
+        are bucketed by (color, size) and each bucket is one fblits() of a prebaked
+        stamp, plus one additive pass of glow stamps when `glow` is on.
+        Returns how many particles were drawn.
+        """
+        n = self.count
+        if n == 0:
+            return 0
+        # Scale based on lifetime
+        sizes = np.clip((self.size[:n] * (self.lifetime[:n] / self.max_lifetime[:n]) * scale).astype(np.int64), 1, 255)
+        xs = ((self.pos[:n, 0].astype(np.int32) + offset_x) * scale).astype(np.int64)
+        ys = ((self.pos[:n, 1].astype(np.int32) + offset_y) * scale).astype(np.int64)
+
+        view = view or surface.get_rect()
+        visible = np.flatnonzero((xs + sizes > view.left) & (xs < view.right) &
+                                 (ys + sizes > view.top) & (ys < view.bottom))
+        if not len(visible):
+            return 0
+
+        # Bucket key: color in the top 24 bits, size in the low 8; sorting groups each bucket
+        color = self.color[visible].astype(np.int64)
+        keys = color[:, 0] << 24 | color[:, 1] << 16 | color[:, 2] << 8 | sizes[visible]
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        xs = xs[visible][order].tolist()
+        ys = ys[visible][order].tolist()
+        bounds = [0, *(np.flatnonzero(keys[1:] != keys[:-1]) + 1).tolist(), len(keys)]
+
+        fblits = surface.fblits
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            key = int(keys[start])
+            size = key & 0xFF
+            rgb = (key >> 24 & 0xFF, key >> 16 & 0xFF, key >> 8 & 0xFF)
+            bx, by = xs[start:end], ys[start:end]
+            fblits(zip(repeat(AssetManager.get_solid((size, size), rgb)), zip(bx, by)))
+            if self.glow:
+                glow = self._glow_stamp(rgb, size)
+                pad = (glow.get_width() - size) // 2
+                fblits([(glow, (x - pad, y - pad)) for x, y in zip(bx, by)], pygame.BLEND_RGB_ADD)
+        return len(visible)
 
 
 class CameraJuice:
     """Handles screen shake, smooth zoom, and player follow."""
-    def __init__(self):
+    def __init__(self, rng: random.Random = None):
+        self.rng = rng or random
         self.shake_duration = 0.0
         self.shake_intensity = 0.0
         self.offset_x = 0
@@ -76,6 +170,8 @@ class CameraJuice:
         # Smooth follow
         self.follow_x = 0.0
         self.follow_y = 0.0
+        self.prev_follow_x = 0.0
+        self.prev_follow_y = 0.0
         
         # Zoom
         self.current_zoom = 1.0
@@ -86,16 +182,20 @@ class CameraJuice:
         self.shake_intensity = max(self.shake_intensity, intensity)
         self.shake_duration = max(self.shake_duration, duration)
 
-    def set_follow_target(self, player_x: float, player_y: float):
+    def set_follow_target(self, player_x: float, player_y: float, dt: float):
         """Set the target for the camera to smoothly follow."""
         # Target: center screen on player
         target_x = -(player_x - SCREEN_WIDTH / 2)
         target_y = -(player_y - SCREEN_HEIGHT / 2)
         
+        # Keep the previous tick's position for render interpolation
+        self.prev_follow_x = self.follow_x
+        self.prev_follow_y = self.follow_y
+        
         # Smooth lerp with delay
         lerp_speed = 3.0
-        self.follow_x += (target_x - self.follow_x) * min(1.0, lerp_speed * 0.016)
-        self.follow_y += (target_y - self.follow_y) * min(1.0, lerp_speed * 0.016)
+        self.follow_x += (target_x - self.follow_x) * min(1.0, lerp_speed * dt)
+        self.follow_y += (target_y - self.follow_y) * min(1.0, lerp_speed * dt)
 
     def set_target_zoom(self, health_ratio: float):
         """
@@ -113,8 +213,8 @@ class CameraJuice:
             
             current_intensity = self.shake_intensity * (self.shake_duration / (self.shake_duration + 0.1))
             
-            self.offset_x = int(random.uniform(-current_intensity, current_intensity))
-            self.offset_y = int(random.uniform(-current_intensity, current_intensity))
+            self.offset_x = int(self.rng.uniform(-current_intensity, current_intensity))
+            self.offset_y = int(self.rng.uniform(-current_intensity, current_intensity))
         else:
             self.shake_duration = 0
             self.shake_intensity = 0
@@ -124,8 +224,11 @@ class CameraJuice:
         # Smooth zoom lerp
         self.current_zoom += (self.target_zoom - self.current_zoom) * min(1.0, 2.0 * dt)
 
-    def get_offset(self) -> Tuple[int, int]:
-        return int(self.follow_x) + self.offset_x, int(self.follow_y) + self.offset_y
+    def get_offset(self, alpha: float = 1.0) -> Tuple[int, int]:
+        """Camera offset, interpolated `alpha` of the way from the previous tick to the current one."""
+        fx = self.prev_follow_x + (self.follow_x - self.prev_follow_x) * alpha
+        fy = self.prev_follow_y + (self.follow_y - self.prev_follow_y) * alpha
+        return int(fx) + self.offset_x, int(fy) + self.offset_y
     
     def get_zoom(self) -> float:
         return self.current_zoom
@@ -1,20 +1,117 @@
 """
 WhitePager - Enemy System and Persistent Echo Mechanics
 """
-import pygame
 import random
-from typing import List, Tuple
-from src.constants import SURFACE_Y, G_SURFACE, G_UNDER
+import sys
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+from src.constants import SURFACE_Y, G_SURFACE, ECHO_QUEUE_CAPACITY
+from src.entities.pool import PooledSprite
+from src.core.assets import AssetManager
 
-# Global persistence list for enemies killed on the Surface
-PendingEchoes: List[dict] = []
 
-class BaseEnemy(pygame.sprite.Sprite):
-    def __init__(self, x: float, y: float, enemy_type: str = "grunt", spawn_direction: str = "left"):
+class EchoScheduler:
+    """
+    Engine-owned queue of echoes waiting to spawn, fed by enemies killed on the Surface.
+    Consecutive echoes of the same type are coalesced into one weighted entry, and
+    the total number of pending echoes (the sum of weights) is capped at `capacity`.
+    At the cap, overflow="drop_newest" discards the incoming echo, while
+    overflow="drop_oldest" sheds one echo from the front entry to make room.
+    Every operation is O(1).
+    """
+    def __init__(self, capacity: int = ECHO_QUEUE_CAPACITY, overflow: str = "drop_newest"):
+        if overflow not in ("drop_newest", "drop_oldest"):
+            raise ValueError(f"Unknown echo overflow policy: {overflow}")
+        self.capacity = capacity
+        self.overflow = overflow
+        self._queue: Deque[dict] = deque()
+        self.pending = 0  # Echoes represented by all entries (sum of weights), <= capacity
+
+        # Stats
+        self.enqueued = 0
+        self.dequeued = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.max_depth = 0
+
+    def __len__(self) -> int:
+        """Pending echoes, not entries."""
+        return self.pending
+
+    def enqueue(self, enemy_type: str, x_spawn: float, y_spawn: float):
+        self.enqueued += 1
+        if self.pending >= self.capacity:
+            self.dropped += 1
+            if self.overflow == "drop_newest":
+                return
+            self._shed_oldest()
+
+        self.pending += 1
+        tail = self._queue[-1] if self._queue else None
+        if tail is not None and tail["type"] == enemy_type:
+            tail["weight"] += 1
+            self.coalesced += 1
+            return
+
+        self._queue.append({"type": enemy_type, "x_spawn": x_spawn, "y_spawn": y_spawn, "weight": 1})
+        self.max_depth = max(self.max_depth, len(self._queue))
+
+    def dequeue(self) -> Optional[Tuple[str, float, float]]:
+        """Takes one echo off the front entry as (type, x_spawn, y_spawn), or returns None when empty."""
+        if not self._queue:
+            return None
+        head = self._queue[0]
+        head["weight"] -= 1
+        self.pending -= 1
+        self.dequeued += 1
+        if head["weight"] <= 0:
+            self._queue.popleft()
+        return head["type"], head["x_spawn"], head["y_spawn"]
+
+    def clear(self):
+        self._queue.clear()
+        self.pending = 0
+
+    def _shed_oldest(self):
+        """Drops one echo from the front entry."""
+        head = self._queue[0]
+        head["weight"] -= 1
+        self.pending -= 1
+        if head["weight"] <= 0:
+            self._queue.popleft()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "depth": len(self._queue),
+            "max_depth": self.max_depth,
+            "pending": self.pending,
+            "enqueued": self.enqueued,
+            "dequeued": self.dequeued,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "bytes": sys.getsizeof(self._queue) + sum(sys.getsizeof(e) for e in self._queue),
+        }
+
+
+class BaseEnemy(PooledSprite):
+    """
+    Surface walker. With a `swarm` (src.core.swarm.EnemySwarm) the enemy is
+    moved by the swarm's batched step and update() is not called.
+    """
+    def __init__(self, x: float, y: float, enemy_type: str = "grunt", spawn_direction: str = "left",
+                 rng: random.Random = None, echo_scheduler: EchoScheduler = None, swarm=None):
         super().__init__()
-        self.image = pygame.Surface((40, 40))
-        self.image.fill((200, 50, 50))
-        self.rect = self.image.get_rect(center=(x, y))
+        self.image = AssetManager.get_solid((40, 40), (200, 50, 50))
+        self.rect = self.image.get_rect()
+        self.reset(x, y, enemy_type, spawn_direction, rng, echo_scheduler, swarm)
+
+    def reset(self, x: float, y: float, enemy_type: str = "grunt", spawn_direction: str = "left",
+              rng: random.Random = None, echo_scheduler: EchoScheduler = None, swarm=None):
+        """Reinitialises a (possibly recycled) enemy in place."""
+        self.rng = rng or random
+        self.echo_scheduler = echo_scheduler
+        self.rect.center = (x, y)
+        self.prev_pos = self.rect.topleft # Don't interpolate from a previous life
         self.pos_x = float(x)
         self.pos_y = float(y)
         self.health: int = 20
@@ -23,6 +120,16 @@ class BaseEnemy(pygame.sprite.Sprite):
         # Simple AI
         self.velocity_x = -150.0 if spawn_direction == "left" else 150.0
         self.velocity_y = 0.0
+        
+        self.swarm = swarm
+        self.slot = -1
+        if swarm is not None:
+            swarm.add(self)
+
+    def kill(self):
+        if self.swarm is not None:
+            self.swarm.remove(self)
+        super().kill()
 
     def take_damage(self, amount: int):
         self.health -= amount
@@ -31,16 +138,14 @@ class BaseEnemy(pygame.sprite.Sprite):
 
     def die(self):
         # When an enemy dies on the Overworld, persist their soul!
-        PendingEchoes.append({
-            "type": self.enemy_type,
-            "x_spawn": self.rect.centerx,
-            "y_spawn": SURFACE_Y + 50 # Spawn just beneath the surface
-        })
+        if self.echo_scheduler is not None:
+            self.echo_scheduler.enqueue(self.enemy_type, self.rect.centerx,
+                                        SURFACE_Y + 50) # Spawn just beneath the surface
         self.kill()
 
     def update(self, dt: float):
         # AI: chance to jump randomly if grounded
-        if random.random() < 0.01 * dt * 60:
+        if self.rng.random() < 0.01 * dt * 60:
             if self.pos_y + self.rect.height / 2 >= SURFACE_Y - 5: 
                 self.velocity_y = -400.0
                 
@@ -56,30 +161,44 @@ class BaseEnemy(pygame.sprite.Sprite):
             
         self.rect.centerx = int(self.pos_x)
         self.rect.centery = int(self.pos_y)
-        
-        # Cleanup if they wander off screen
-        if self.rect.right < -200:
-            self.kill()
+        # Despawning far-away enemies is handled by the engine's StreamingWindow
 
 
-class Echo(pygame.sprite.Sprite):
+class Echo(PooledSprite):
     """
     The spectral variant of a fallen enemy that flees from the player in the Under-realm.
+    With a `swarm` (src.core.swarm.EchoSwarm) it is moved by the swarm's batched step.
     """
-    def __init__(self, x: float, y: float, enemy_type: str):
+    def __init__(self, x: float, y: float, enemy_type: str, rng: random.Random = None, swarm=None):
         super().__init__()
-        self.image = pygame.Surface((40, 40))
-        self.image.fill((50, 200, 150)) # Spectral greenish
-        self.image.set_alpha(150) # Ghostly appearance
-        self.rect = self.image.get_rect(center=(x, y))
+        # Spectral greenish, ghostly appearance
+        self.image = AssetManager.get_solid((40, 40), (50, 200, 150), alpha=150)
+        self.rect = self.image.get_rect()
+        self.chase_speed = 100.0
+        self.reset(x, y, enemy_type, rng, swarm)
+
+    def reset(self, x: float, y: float, enemy_type: str, rng: random.Random = None, swarm=None):
+        """Reinitialises a (possibly recycled) echo in place."""
+        self.rng = rng or random
+        self.rect.center = (x, y)
+        self.prev_pos = self.rect.topleft # Don't interpolate from a previous life
         self.pos_x = float(x)
         self.pos_y = float(y)
         self.enemy_type = enemy_type
         self.velocity_x = 0.0
         self.velocity_y = 0.0
-        self.chase_speed = 100.0
         self.health = 20
         
+        self.swarm = swarm
+        self.slot = -1
+        if swarm is not None:
+            swarm.add(self)
+
+    def kill(self):
+        if self.swarm is not None:
+            self.swarm.remove(self)
+        super().kill()
+        
     def take_damage(self, amount: int):
         self.health -= amount
         if self.health <= 0:
@@ -94,11 +213,11 @@ class Echo(pygame.sprite.Sprite):
             
         # AI: Teleport closer if player is running away (too far)
         if abs(self.pos_x - player_x) > 1200:
-            offset = random.choice([-500, 500])
+            offset = self.rng.choice([-500, 500])
             self.pos_x = player_x + offset
             
         # AI: Chance to jump from the ceiling (inverted gravity)
-        if random.random() < 0.01 * dt * 60:
+        if self.rng.random() < 0.01 * dt * 60:
             if self.pos_y - self.rect.height / 2 <= SURFACE_Y + 5:
                 self.velocity_y = 400.0 # Positive jumps down since gravity goes up
             
@@ -10,13 +10,13 @@ from src.constants import (
     PLAYER_SPEED, JUMP_FORCE, BURST_UP_FORCE,
     SOUL_DRAIN_RATE, MAX_SOUL_ENERGY
 )
-from src.entities.projectiles import Bullet
+from src.entities.projectiles import ProjectileBuffer
+from src.core.assets import AssetManager
 
 class Player(pygame.sprite.Sprite):
     def __init__(self, x: float, y: float):
         super().__init__()
-        self.image = pygame.Surface((50, 70))
-        self.image.fill((255, 255, 255))
+        self.image = AssetManager.get_solid((50, 70), (255, 255, 255))
         self.rect = self.image.get_rect(midbottom=(x, y))
         
         # Physics
@@ -37,8 +37,8 @@ class Player(pygame.sprite.Sprite):
         self.dash_time_left = 0.0
         self.facing_right = True
         
-        # Optional Group reference for firing bullets
-        self.bullet_group: Optional[pygame.sprite.Group] = None
+        # Projectile store bullets are fired into; set by the engine
+        self.projectiles: Optional[ProjectileBuffer] = None
         
         # Escape portals (list of (x, y, radius))
         self.escape_portals = []  # Will be set by the engine
@@ -48,9 +48,8 @@ class Player(pygame.sprite.Sprite):
         """Triggers the transition into the Under-realm."""
         self.is_alive = False
         self.soul_energy = 50.0  # Start with 50 soul energy
-        self.image.fill((150, 200, 255)) # Shift to spectral blue
-        self.image.set_alpha(150) # Ghostly transparency
-        self.image = pygame.transform.flip(self.image, True, False) # Flip Horizontally
+        # Spectral blue, ghostly transparency, flipped horizontally
+        self.image = AssetManager.get_solid((50, 70), (150, 200, 255), alpha=150, flip_x=True)
         # Push player slightly down so they pass the line
         self.pos_y = SURFACE_Y + self.rect.height / 2 + 5.0
 
@@ -58,17 +57,13 @@ class Player(pygame.sprite.Sprite):
         """Triggers the massive geyser return to the Living plane."""
         self.is_alive = True
         self.health = 100
-        # Completely reset the image surface to clear spectral alpha artifacts
-        self.image = pygame.Surface((50, 70))
-        self.image.fill((255, 255, 255))
-        # Ensure correct facing direction is maintained
-        if not self.facing_right:
-            self.image = pygame.transform.flip(self.image, True, False)
+        # Swap back to the opaque surface, keeping the facing direction
+        self.image = AssetManager.get_solid((50, 70), (255, 255, 255), flip_x=not self.facing_right)
         self.velocity_y = BURST_UP_FORCE # The massive launch upward
 
     def shoot(self, target_x: float, target_y: float) -> bool:
-        """Instantiates a Bullet towards the target coordinates. Returns True if a bullet was fired."""
-        if self.bullet_group is None or self.fire_cooldown > 0:
+        """Spawns a bullet towards the target coordinates. Returns True if a bullet was fired."""
+        if self.projectiles is None or self.fire_cooldown > 0:
             return False
             
         dx = target_x - self.rect.centerx
@@ -79,8 +74,8 @@ class Player(pygame.sprite.Sprite):
         v_x = (dx / dist) * speed
         v_y = (dy / dist) * speed
             
-        bullet = Bullet(self.rect.centerx, self.rect.centery, v_x, v_y, (255, 200, 0))
-        self.bullet_group.add(bullet)
+        if not self.projectiles.spawn(self.rect.centerx, self.rect.centery, v_x, v_y, (255, 200, 0)):
+            return False
         
         # Determine facing for melee offsets
         self.facing_right = v_x >= 0
@@ -0,0 +1,68 @@
+"""
+WhitePager - Entity Pooling
+Recycles killed sprites instead of reallocating them on every spawn.
+"""
+import abc
+import pygame
+from typing import Dict, List, Optional
+
+
+class PooledSprite(pygame.sprite.Sprite, metaclass=abc.ABCMeta):
+    """
+    Sprite that returns itself to its pool when killed.
+    Subclasses implement reset() with the same arguments as __init__.
+    """
+    pool: Optional["EntityPool"] = None
+
+    @abc.abstractmethod
+    def reset(self, *args, **kwargs):
+        """Reinitialises a recycled sprite in place."""
+
+    def kill(self):
+        # Only release on the live -> dead transition; kill() is often called twice in one tick
+        was_alive = self.alive()
+        super().kill()
+        if was_alive and self.pool is not None:
+            self.pool.release(self)
+
+
+class EntityPool:
+    """Factory that hands out recycled PooledSprites of a single class."""
+    def __init__(self, cls, max_free: int = 512):
+        self.cls = cls
+        self.max_free = max_free
+        self._free: List[PooledSprite] = []
+
+        # Stats
+        self.created = 0
+        self.reused = 0
+        self.released = 0
+        self.discarded = 0
+
+    def acquire(self, *args, **kwargs) -> PooledSprite:
+        """Returns a sprite initialised with the given constructor arguments."""
+        if self._free:
+            sprite = self._free.pop()
+            sprite.reset(*args, **kwargs)
+            self.reused += 1
+        else:
+            sprite = self.cls(*args, **kwargs)
+            sprite.pool = self
+            self.created += 1
+        return sprite
+
+    def release(self, sprite: PooledSprite):
+        if len(self._free) < self.max_free:
+            self._free.append(sprite)
+            self.released += 1
+        else:
+            self.discarded += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "created": self.created,
+            "reused": self.reused,
+            "released": self.released,
+            "discarded": self.discarded,
+            "free": len(self._free),
+        }
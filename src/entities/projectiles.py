@@ -3,43 +3,241 @@ WhitePager - Bullet/Projectile Systems
 Includes the slow projectile conditional logic.
 """
 import pygame
-from typing import Tuple
-
-from src.constants import SURFACE_Y, GHOST_BLUE, BLACK, DRAG_UNDER
-
-class Bullet(pygame.sprite.Sprite):
-    def __init__(self, x: float, y: float, velocity_x: float, velocity_y: float, color: Tuple[int, int, int]):
-        super().__init__()
-        self.image = pygame.Surface((12, 12)) # make it square since it goes 4 ways
-        self.color = color
-        self.image.fill(self.color)
-        
-        self.rect = self.image.get_rect(center=(x, y))
-        self.pos_x = float(x)
-        self.pos_y = float(y)
-        self.velocity_x = velocity_x
-        self.velocity_y = velocity_y
-        
-        # Determine if initially spawned under the surface
-        self.in_under_realm = self.pos_y > SURFACE_Y
-        self.lifetime = 2.0  # seconds until it despawns
+import numpy as np
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.constants import SURFACE_Y, GHOST_BLUE, MAX_PROJECTILES
+from src.core.assets import AssetManager
+
+BULLET_SIZE: int = 12          # Square since it goes 4 ways
+BULLET_LIFETIME: float = 2.0   # Seconds until a bullet despawns
+MEDIUM_SLOWDOWN: float = 0.4   # Velocity kept when a bullet enters the Under-realm
+
+class ProjectileBuffer:
+    """
+    Fixed-capacity structure-of-arrays store for every live bullet, in place of
+    a Sprite + Surface per bullet. Positions are bullet top-lefts. Each update
+    keeps the previous positions so hit tests sweep the whole segment travelled
+    this tick (no tunnelling through 40 px enemies at 800 px/s) and drawing can
+    interpolate. Dead slots are swap-removed.
+    """
+    def __init__(self, capacity: int = MAX_PROJECTILES, size: int = BULLET_SIZE):
+        self.capacity = capacity
+        self.size = size
+        self.count = 0
+
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.prev_x = np.zeros(capacity)
+        self.prev_y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.lifetime = np.zeros(capacity)
+        self.under = np.zeros(capacity, dtype=bool)
+        self.color_id = np.zeros(capacity, dtype=np.uint8)
+        self._fields = (self.x, self.y, self.prev_x, self.prev_y, self.vx, self.vy,
+                        self.lifetime, self.under, self.color_id)
+
+        # Few distinct colors: bullets store an index into this palette
+        self.palette: List[Tuple[int, int, int]] = []
+        self._palette_ids: Dict[Tuple[int, int, int], int] = {}
+        self._under_color = self._color_id(GHOST_BLUE)
+
+        # Stats
+        self.spawned = 0
+        self.dropped = 0
+        self.hits = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _color_id(self, color: Tuple[int, int, int]) -> int:
+        color = tuple(color)
+        cid = self._palette_ids.get(color)
+        if cid is None:
+            cid = self._palette_ids[color] = len(self.palette)
+            self.palette.append(color)
+        return cid
+
+    def spawn(self, x: float, y: float, velocity_x: float, velocity_y: float,
+              color: Tuple[int, int, int]) -> bool:
+        """Adds a bullet centered on (x, y). Returns False if the buffer is full."""
+        if self.count >= self.capacity:
+            self.dropped += 1
+            return False
+        i = self.count
+        # The bullet's square is centered on integer coordinates
+        left = int(x) - self.size // 2
+        top = int(y) - self.size // 2
+        self.x[i] = self.prev_x[i] = left
+        self.y[i] = self.prev_y[i] = top
+        self.vx[i] = velocity_x
+        self.vy[i] = velocity_y
+        self.lifetime[i] = BULLET_LIFETIME
+        self.under[i] = top > SURFACE_Y
+        self.color_id[i] = self._under_color if self.under[i] else self._color_id(color)
+        self.count += 1
+        self.spawned += 1
+        return True
 
     def update(self, dt: float):
-        self.pos_x += self.velocity_x * dt
-        self.pos_y += self.velocity_y * dt
-        self.rect.x = int(self.pos_x)
-        self.rect.y = int(self.pos_y)
+        n = self.count
+        if n == 0:
+            return
+        x, y, vx, vy = self.x[:n], self.y[:n], self.vx[:n], self.vy[:n]
+        self.prev_x[:n] = x
+        self.prev_y[:n] = y
+        x += vx * dt
+        y += vy * dt
 
         # Conditional physics: Enter denser medium
-        if self.rect.y > SURFACE_Y and not self.in_under_realm:
-            self.in_under_realm = True
-            self.velocity_x *= 0.4  # Massively slow down the bullet
-            self.velocity_y *= 0.4
-            self.color = GHOST_BLUE
-            self.image.fill(self.color)
-            
-            
+        entering = ~self.under[:n] & (y.astype(np.int64) > SURFACE_Y)
+        if entering.any():
+            self.under[:n] |= entering
+            vx[entering] *= MEDIUM_SLOWDOWN  # Massively slow down the bullet
+            vy[entering] *= MEDIUM_SLOWDOWN
+            self.color_id[:n][entering] = self._under_color
+
         # Lifetime kill instead of fixed screen coords
-        self.lifetime -= dt
-        if self.lifetime <= 0:
-            self.kill()
+        self.lifetime[:n] -= dt
+        self._compact()
+
+    def _compact(self):
+        n = self.count
+        live = self.lifetime[:n] > 0
+        k = int(np.count_nonzero(live))
+        if k < n:
+            holes = np.flatnonzero(~live[:k])
+            movers = np.flatnonzero(live[k:]) + k
+            for field in self._fields:
+                field[holes] = field[movers]
+            self.count = k
+
+    def cull(self, lo: float, hi: float) -> int:
+        """Despawns bullets whose center left the [lo, hi] x range. Returns how many."""
+        n = self.count
+        if n == 0:
+            return 0
+        cx = self.x[:n] + self.size / 2
+        outside = (cx < lo) | (cx > hi)
+        removed = int(np.count_nonzero(outside))
+        if removed:
+            self.lifetime[:n][outside] = 0.0
+            self._compact()
+        return removed
+
+    def clear(self):
+        self.count = 0
+
+    def collide(self, targets: Sequence[pygame.sprite.Sprite],
+                on_hit: Callable[[pygame.sprite.Sprite], None]) -> int:
+        """
+        Swept hit test of this tick's bullet segments against the targets' rects.
+        Each bullet stops at the first live target along its segment: on_hit(target)
+        is called, in bullet order, and the bullet is removed. Targets killed by an
+        earlier hit are skipped. Returns the number of hits.
+        """
+        n = self.count
+        if n == 0 or not targets:
+            return 0
+        sprites = list(targets)
+        rects = np.array([s.rect[:] for s in sprites], dtype=np.float64).reshape(-1, 4)
+        order = np.argsort(rects[:, 0], kind="stable")
+        rects = rects[order]
+        left, top = rects[:, 0], rects[:, 1]
+        right, bottom = left + rects[:, 2], top + rects[:, 3]
+        max_w = rects[:, 2].max()
+
+        # Sweep over x: a target can only be hit if its left edge lies within the
+        # bullet's swept x span, widened by the widest target on the left
+        x0, y0 = self.prev_x[:n], self.prev_y[:n]
+        dx, dy = self.x[:n] - x0, self.y[:n] - y0
+        span_lo = np.minimum(x0, self.x[:n])
+        span_hi = np.maximum(x0, self.x[:n]) + self.size
+        lo = np.searchsorted(left, span_lo - max_w, side="right")
+        hi = np.searchsorted(left, span_hi, side="left")
+        counts = np.maximum(hi - lo, 0)
+        total = int(counts.sum())
+        if total == 0:
+            return 0
+        bi = np.repeat(np.arange(n), counts)
+        starts = np.cumsum(counts) - counts
+        ti = np.repeat(lo, counts) + np.arange(total) - np.repeat(starts, counts)
+
+        # Segment of the top-left corner against each target grown by the bullet size
+        t_enter, t_exit = self._slab(x0[bi], dx[bi], left[ti] - self.size, right[ti])
+        ty_enter, ty_exit = self._slab(y0[bi], dy[bi], top[ti] - self.size, bottom[ti])
+        t_enter = np.maximum(np.maximum(t_enter, ty_enter), 0.0)
+        t_exit = np.minimum(np.minimum(t_exit, ty_exit), 1.0)
+        hit = t_enter < t_exit
+        if not hit.any():
+            return 0
+        bi, ti, t_enter = bi[hit], ti[hit], t_enter[hit]
+        # Per bullet, nearest target first
+        by_time = np.lexsort((t_enter, bi))
+
+        hits = 0
+        consumed = -1
+        for b, t in zip(bi[by_time].tolist(), ti[by_time].tolist()):
+            if b == consumed:
+                continue
+            target = sprites[order[t]]
+            if not target.alive():
+                continue
+            consumed = b
+            self.lifetime[b] = 0.0
+            on_hit(target)
+            hits += 1
+        if hits:
+            self.hits += hits
+            self._compact()
+        return hits
+
+    @staticmethod
+    def _slab(p0: np.ndarray, d: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Parametric [enter, exit) interval of p0 + t * d inside the open range (lo, hi)."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t1 = (lo - p0) / d
+            t2 = (hi - p0) / d
+        enter = np.minimum(t1, t2)
+        exit_ = np.maximum(t1, t2)
+        # Not moving on this axis: inside for all t or never
+        still = d == 0
+        inside = (p0 > lo) & (p0 < hi)
+        enter = np.where(still, np.where(inside, -np.inf, np.inf), enter)
+        exit_ = np.where(still, np.where(inside, np.inf, -np.inf), exit_)
+        return enter, exit_
+
+    def positions(self) -> List[Tuple[int, int]]:
+        """Integer top-lefts of the live bullets."""
+        n = self.count
+        return list(zip(self.x[:n].astype(np.int64).tolist(), self.y[:n].astype(np.int64).tolist()))
+
+    def draw(self, surface: pygame.Surface, offset_x: int, offset_y: int, scale: float = 1.0,
+             alpha: float = 1.0, view: Optional[pygame.Rect] = None) -> int:
+        """
+        Draws bullets `alpha` of the way from their previous to current position at
+        (pos + offset) * scale, one blits() call per color, skipping those outside
+        `view` (default: the whole surface). Returns how many were drawn.
+        """
+        n = self.count
+        if n == 0:
+            return 0
+        px, py = self.prev_x[:n], self.prev_y[:n]
+        ix = (px + (self.x[:n] - px) * alpha).astype(np.int64)
+        iy = (py + (self.y[:n] - py) * alpha).astype(np.int64)
+        sx = ((ix + offset_x) * scale).astype(np.int64)
+        sy = ((iy + offset_y) * scale).astype(np.int64)
+        size = max(1, round(self.size * scale))
+        view = view or surface.get_rect()
+        visible = (sx > view.left - size) & (sx < view.right) & (sy > view.top - size) & (sy < view.bottom)
+        drawn = 0
+        color_id = self.color_id[:n]
+        for cid, color in enumerate(self.palette):
+            mask = visible & (color_id == cid)
+            if not mask.any():
+                continue
+            image = AssetManager.get_solid((size, size), color)
+            surface.blits([(image, pos) for pos in zip(sx[mask].tolist(), sy[mask].tolist())], doreturn=False)
+            drawn += int(np.count_nonzero(mask))
+        return drawn
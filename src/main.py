@@ -2,39 +2,125 @@
 WhitePager - Main Game Engine
 Handles initialization, main loop, 60 FPS constraint, and rendering pipeline.
 """
+import os
 import pygame
 import sys
 import random
 import asyncio
+import time
+import hashlib
+from collections import deque
+from typing import Tuple
 
 from src.constants import (
     SCREEN_WIDTH, SCREEN_HEIGHT, FPS, BLACK, SURFACE_Y, NEON_GLOW,
-    GHOST_BLUE, SURFACE_COLOR, MAX_SOUL_ENERGY
+    GHOST_BLUE, SURFACE_COLOR, MAX_SOUL_ENERGY, WHITE,
+    SIM_DT, MAX_FRAME_DT, MAX_SIM_STEPS, CULL_MARGIN,
+    RENDER_WIDTH, RENDER_HEIGHT, SMOOTH_UPSCALE, PROFILER_TRACE_FRAMES, SWARM_BACKEND,
+    PIPELINED_RENDER, PROFILER_HISTORY, POST_BACKEND, POST_THREADS
 )
 from src.entities.player import Player
-from src.entities.enemies import BaseEnemy, Echo, PendingEchoes
+from src.entities.enemies import BaseEnemy, Echo, EchoScheduler
+from src.entities.projectiles import ProjectileBuffer
+from src.entities.pool import EntityPool
 from src.core.vfx import ParticleSystem, CameraJuice
 from src.core.post_processing import PostProcessor
+from src.core.profiler import FrameProfiler
+from src.core.pipeline import RenderPipeline
 from src.core.audio import AudioManager
+from src.core.assets import AssetManager
+from src.core.preload import AssetPreloader
+from src.core.quality import QualityGovernor
+from src.core.input import LiveInput, BotInput
+from src.core.replay import InputRecorder, Replay
+from src.core.broadphase import SweepIndex
+from src.core.streaming import StreamingWindow
+from src.core.swarm import EnemySwarm, EchoSwarm
+from src.core.hud import HUD
 
 class GameEngine:
-    def __init__(self):
+    def __init__(self, headless: bool = False, seed: int = None, input_source=None,
+                 render_size: Tuple[int, int] = (RENDER_WIDTH, RENDER_HEIGHT), smooth_upscale: bool = SMOOTH_UPSCALE,
+                 record_path: str = None, swarm_backend: str = SWARM_BACKEND, pipelined: bool = PIPELINED_RENDER,
+                 post_backend: str = POST_BACKEND, post_threads: int = POST_THREADS):
+        """
+        headless: use SDL's dummy video/audio drivers and a bot input source.
+        seed: seeds every RNG the simulation uses, for reproducible runs.
+        input_source: overrides where keyboard/mouse/events come from.
+        render_size: internal resolution for the world and post-processing, same aspect as the window.
+        smooth_upscale: smoothscale (instead of nearest-neighbour) up to the window.
+        record_path: record every frame's input to this replay file (written when the run ends).
+        swarm_backend: "vectorized" moves enemies/echoes in batched NumPy steps, "sprites" per sprite.
+        pipelined: post-process and upscale each frame on a worker thread while the next one simulates.
+        post_backend: "blend" (pygame blits) or "numpy" (array kernels) for aberration and bloom.
+        post_threads: row bands the numpy post-processing kernels split full-screen passes into.
+        """
+        self.render_w, self.render_h = render_size
+        self.render_scale = self.render_w / SCREEN_WIDTH  # World px -> internal px
+        if abs(self.render_h - SCREEN_HEIGHT * self.render_scale) > 1:
+            raise ValueError(f"Render size {render_size} must keep the {SCREEN_WIDTH}x{SCREEN_HEIGHT} aspect ratio")
+        self.smooth_upscale = smooth_upscale
+        self.headless = headless
+        if headless:
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
         pygame.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        self.render_surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)) # Offscreen render target
+        self.render_surf = pygame.Surface(render_size).convert() # Offscreen render target, internal resolution
+        self._scaled_images = {}  # Shared sprite image -> copy at internal resolution
         pygame.display.set_caption("Souls of the Beneath")
         self.clock = pygame.time.Clock()
         
+        # Single seeded RNG shared by the engine, enemies and VFX. An unseeded run
+        # still picks a concrete seed so it can be recorded and replayed.
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self.rng = random.Random(self.seed)
+        # The bot draws from its own stream so a replay (which has no bot) sees the same engine RNG
+        self.input = input_source or (BotInput(random.Random(self.seed + 1)) if headless else LiveInput())
+        self.record_path = record_path
+        self.recorder = None
+        if record_path:
+            self.recorder = self.input = InputRecorder(self.input, self.seed)
+        
         # Groups
         self.all_sprites = pygame.sprite.Group()
         self.enemies = pygame.sprite.Group()
         self.echoes = pygame.sprite.Group()
-        self.bullets = pygame.sprite.Group()
+        
+        # Every bullet lives in one array-backed buffer, not a Sprite each
+        self.projectiles = ProjectileBuffer()
+        
+        # Pools recycle killed sprites and their Surfaces
+        self.enemy_pool = EntityPool(BaseEnemy)
+        self.echo_pool = EntityPool(Echo)
+        
+        # Batched movement for enemies and echoes (None: each sprite updates itself)
+        if swarm_backend not in ("vectorized", "sprites"):
+            raise ValueError(f"Unknown swarm backend: {swarm_backend}")
+        self.enemy_swarm = EnemySwarm(seed=self.rng.getrandbits(32)) if swarm_backend == "vectorized" else None
+        self.echo_swarm = EchoSwarm(seed=self.rng.getrandbits(32)) if swarm_backend == "vectorized" else None
+        
+        # Souls of enemies killed on the Surface, waiting to return as Echoes
+        self.echo_scheduler = EchoScheduler()
+        
+        # Despawns far-away entities and enforces per-type live budgets
+        self.streaming = StreamingWindow()
+        
+        # Broadphase indices, rebuilt each tick after movement
+        self.enemy_index = SweepIndex()
+        self.echo_index = SweepIndex()
         
         # VFX
-        self.vfx = ParticleSystem()
-        self.camera = CameraJuice()
-        self.post_processor = PostProcessor(SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.vfx = ParticleSystem(seed=self.rng.getrandbits(32))
+        self.camera = CameraJuice(self.rng)
+        # Section timings (F3 overlay, F4 trace export); a no-op until enabled
+        self.profiler = FrameProfiler()
+        self.post_processor = PostProcessor(self.render_w, self.render_h, profiler=self.profiler,
+                                            backend=post_backend, threads=post_threads)
+        
+        # Adaptive quality: steps effects down when frames overrun the budget
+        self.quality = QualityGovernor()
+        self.quality.add_listener(self._on_quality_change)
         
         # Inter-state vars
         self.shattered = False
@@ -42,30 +128,74 @@ class GameEngine:
         self.level = 1
         self.time_survived = 0.0
         self.target_spawn_time = 2.0
-        self.dt = 0.016  # Default dt
+        self.dt = SIM_DT  # Default dt
+        self.render_fps = FPS  # Render rate; the simulation always ticks at SIM_HZ
+        self.dropped_sim_time = 0.0  # Seconds discarded by the catch-up cap
+        self.sprites_drawn = 0  # Per-frame culling counters
+        self.sprites_culled = 0
         self.escape_portals = []  # List of (x, y, radius) for floating portals
         self.echo_spawn_timer = 0.0  # Timer for spawning echoes near portals in underground
         
         # Initial Entities
         self.player = Player(400, SURFACE_Y - 50)
-        self.player.bullet_group = self.bullets
+        self.player.projectiles = self.projectiles
         self.all_sprites.add(self.player)
         
         # Spawn some test enemies
         for i in range(3):
-            enemy = BaseEnemy(800 + i * 150, SURFACE_Y - 50)
+            enemy = self.enemy_pool.acquire(800 + i * 150, SURFACE_Y - 50, rng=self.rng,
+                                            echo_scheduler=self.echo_scheduler, swarm=self.enemy_swarm)
             self.enemies.add(enemy)
             self.all_sprites.add(enemy)
             
         self.running = True
-        self.font = pygame.font.SysFont(None, 36)
+        self.hud = HUD(SCREEN_WIDTH, SCREEN_HEIGHT)
+        
+        # Render pipeline: double-buffers render_surf and owns the post-processing worker
+        self.pipeline = RenderPipeline(self._post_and_zoom, render_size, profiler=self.profiler) if pipelined else None
+        self.frame_latency_ms = deque(maxlen=PROFILER_HISTORY)  # Frame start -> flip
         
-        # Audio
-        self.audio = AudioManager()
-        self.audio.start_music()
+        # Audio and file assets arrive in the loading stage (load_assets), not here
+        self.preloader = AssetPreloader()
+        self.audio = None
+
+    async def load_assets(self):
+        """Loading stage: decodes the asset manifest while drawing a progress bar."""
+        await self.preloader.load(None if self.headless else self._draw_loading_screen)
+        self._on_assets_loaded()
+
+    def load_assets_blocking(self):
+        """Synchronous loading stage for headless runs and tools."""
+        self.preloader.load_blocking()
+        self._on_assets_loaded()
+
+    def _on_assets_loaded(self):
+        self.audio = AudioManager(self.preloader.sounds, self.preloader.music)
+        if not self.headless:
+            self.audio.start_music()
+        # From here on, update/draw must never hit the disk
+        AssetManager.lock()
+
+    def _draw_loading_screen(self, done: int, total: int, name: str):
+        self.input.get_events()  # Keep the window responsive
+        self.screen.fill(BLACK)
+        bar = pygame.Rect(0, 0, SCREEN_WIDTH // 2, 24)
+        bar.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+        pygame.draw.rect(self.screen, GHOST_BLUE, bar, 2)
+        pygame.draw.rect(self.screen, NEON_GLOW, (bar.x + 4, bar.y + 4, int((bar.w - 8) * done / total), bar.h - 8))
+        text = self.hud.render_text(f"Loading {name}...", "body", WHITE)
+        self.screen.blit(text, (bar.centerx - text.get_width() // 2, bar.bottom + 16))
+        pygame.display.flip()
+
+    def _on_quality_change(self, old_tier, new_tier, percentile_ms: float):
+        """Pushes a new quality tier into the render pipeline."""
+        self.flush_pipeline()  # The worker must not be mid-frame while post-processing buffers change
+        self.post_processor.apply_quality(new_tier)
+        self.vfx.max_live = new_tier.max_particles
 
     def handle_events(self):
-        for event in pygame.event.get():
+        self.input.begin_frame(self)
+        for event in self.input.get_events():
             if event.type == pygame.QUIT:
                 self.running = False
             
@@ -74,14 +204,22 @@ class GameEngine:
                 if event.key == pygame.K_ESCAPE:
                     self.running = False
                 
+                # Profiler: F3 toggles recording + overlay, F4 dumps a Chrome trace
+                if event.key == pygame.K_F3:
+                    self.profiler.toggle()
+                if event.key == pygame.K_F4 and self.profiler.enabled:
+                    path = f"trace_{time.strftime('%Y%m%d_%H%M%S')}.json"
+                    count = self.profiler.export_chrome_trace(path, frames=PROFILER_TRACE_FRAMES)
+                    print(f"Profiler: wrote {count} events to {path}")
+                
                 # Combat handling
                 if event.key == pygame.K_k: # Melee Attack
                     hitbox = self.player.melee_attack()
-                    for enemy in self.enemies:
-                        if hitbox.colliderect(enemy.rect):
-                            enemy.take_damage(10)
-                            self.camera.add_shake(5.0, 0.1) # Hitstop/Shake feel
-                            self.vfx.emit_explosion(enemy.rect.centerx, enemy.rect.centery, SURFACE_COLOR, 15)
+                    self.enemy_index.rebuild(self.enemies)
+                    for enemy in self.enemy_index.query(hitbox):
+                        enemy.take_damage(10)
+                        self.camera.add_shake(5.0, 0.1) # Hitstop/Shake feel
+                        self.vfx.emit_explosion(enemy.rect.centerx, enemy.rect.centery, SURFACE_COLOR, 15)
                 
                 if event.key == pygame.K_LSHIFT: # Dash
                     self.player.dash()
@@ -95,7 +233,8 @@ class GameEngine:
 
     def update(self, dt: float):
         self.dt = dt
-        keys = pygame.key.get_pressed()
+        prof = self.profiler
+        keys = self.input.get_pressed()
         
         # Level Scaling (only advance when alive)
         if self.player.is_alive:
@@ -114,15 +253,17 @@ class GameEngine:
             
         dt_scaled = dt * time_scale
             
-        mouse_pressed = pygame.mouse.get_pressed()
-        if mouse_pressed[0] and self.player.is_alive: # Left click Auto-fire (Only overworld)
-            mx, my = pygame.mouse.get_pos()
+        self.audio.update(dt, self.player.pos_x)
+        
+        mouse_pressed = self.input.get_mouse_pressed()
+        if mouse_pressed[0] and self.player.is_alive and self.streaming.has_room("bullets", len(self.projectiles)): # Left click Auto-fire (Only overworld)
+            mx, my = self.input.get_mouse_pos()
             cx, cy = self.camera.get_offset()
             if self.player.shoot(mx - cx, my - cy):
-                self.audio.play_shoot()
+                self.audio.play_shoot(self.player.pos_x)
         
         # Camera follow & zoom
-        self.camera.set_follow_target(self.player.pos_x, self.player.pos_y)
+        self.camera.set_follow_target(self.player.pos_x, self.player.pos_y, dt)
         if self.player.is_alive:
             self.camera.set_target_zoom(self.player.health / 100.0)
             self.audio.update_music_speed(self.player.health, 100.0)
@@ -131,51 +272,64 @@ class GameEngine:
             self.audio.update_music_speed(self.player.soul_energy, 100.0)
         
         # Update Vfx and Camera
-        self.vfx.update(dt_scaled)
+        with prof.section("update.vfx"):
+            self.vfx.update(dt_scaled)
         self.camera.update(dt) # Camera runs in real time (screenshake unaffected by slo-mo)
         
         # Update Player
-        self.player.update(dt_scaled, keys)
+        with prof.section("update.player"):
+            self.player.update(dt_scaled, keys)
+        
+        # Drop everything that fell outside the streaming window
+        self.streaming.recenter(self.player.pos_x)
+        self.streaming.cull("enemies", self.enemies)
+        self.streaming.cull("echoes", self.echoes)
+        self.streaming.cull_buffer("bullets", self.projectiles)
         
         if self.player.is_alive:
             # Player is alive: Handle Overworld logic
-            self.enemies.update(dt_scaled)
-            self.bullets.update(dt_scaled)
+            with prof.section("update.enemies"):
+                if self.enemy_swarm is not None:
+                    self.enemy_swarm.step(dt_scaled)
+                else:
+                    self.enemies.update(dt_scaled)
+            with prof.section("update.bullets"):
+                self.projectiles.update(dt_scaled)
             
-            # Check bullet-enemy collisions
-            for bullet in self.bullets:
-                hit_enemies = pygame.sprite.spritecollide(bullet, self.enemies, False)
-                for enemy in hit_enemies:
-                    enemy.take_damage(10)
-                    bullet.kill()
-                    self.vfx.emit_explosion(enemy.rect.centerx, enemy.rect.centery, NEON_GLOW, 10)
+            with prof.section("collisions"):
+                # Check bullet-enemy collisions along each bullet's path this tick
+                self.projectiles.collide(self.enemies, self._on_bullet_hit_enemy)
                     
-            # Check enemy-player collisions
-            hit_by_enemies = pygame.sprite.spritecollide(self.player, self.enemies, False)
-            for enemy in hit_by_enemies:
-                # Add a simple cooldown or knockback to prevent instant death
-                # For hackathon simplicity: apply damage and destroy the enemy
-                self.player.take_damage(15)
-                enemy.die() # Still leaves an echo!
-                self.camera.add_shake(10.0, 0.2)
-                self.vfx.emit_explosion(self.player.rect.centerx, self.player.rect.centery, SURFACE_COLOR, 20)
-                self.audio.play_hurt()
+                # Check enemy-player collisions
+                self.enemy_index.rebuild(self.enemies)
+                hit_by_enemies = self.enemy_index.query(self.player.rect)
+                for enemy in hit_by_enemies:
+                    # Add a simple cooldown or knockback to prevent instant death
+                    # For hackathon simplicity: apply damage and destroy the enemy
+                    self.player.take_damage(15)
+                    enemy.die() # Still leaves an echo!
+                    self.camera.add_shake(10.0, 0.2)
+                    self.vfx.emit_explosion(self.player.rect.centerx, self.player.rect.centery, SURFACE_COLOR, 20)
+                    self.audio.play_hurt(self.player.pos_x)
                 
-            # Enemy Spawning Logic
-            self.spawn_timer += dt_scaled
-            if self.spawn_timer > self.target_spawn_time:
-                self.spawn_timer = 0.0
-                # Spawn relative to the PLAYER position for infinite scrolling
-                spawn_side = random.choice(["left", "right"])
-                if spawn_side == "left":
-                    x = self.player.pos_x - SCREEN_WIDTH - 50
-                    direction = "right"
-                else:
-                    x = self.player.pos_x + SCREEN_WIDTH + 50
-                    direction = "left"
-                new_enemy = BaseEnemy(x, SURFACE_Y - 50, spawn_direction=direction)
-                self.enemies.add(new_enemy)
-                self.all_sprites.add(new_enemy)
+            with prof.section("spawning"):
+                # Enemy Spawning Logic - eases off as the live budget fills up
+                self.spawn_timer += dt_scaled
+                spawn_interval = self.target_spawn_time * self.streaming.spawn_interval_scale("enemies", len(self.enemies))
+                if self.spawn_timer > spawn_interval and self.streaming.has_room("enemies", len(self.enemies)):
+                    self.spawn_timer = 0.0
+                    # Spawn relative to the PLAYER position for infinite scrolling
+                    spawn_side = self.rng.choice(["left", "right"])
+                    if spawn_side == "left":
+                        x = self.player.pos_x - SCREEN_WIDTH - 50
+                        direction = "right"
+                    else:
+                        x = self.player.pos_x + SCREEN_WIDTH + 50
+                        direction = "left"
+                    new_enemy = self.enemy_pool.acquire(x, SURFACE_Y - 50, spawn_direction=direction, rng=self.rng,
+                                                        echo_scheduler=self.echo_scheduler, swarm=self.enemy_swarm)
+                    self.enemies.add(new_enemy)
+                    self.all_sprites.add(new_enemy)
             
             # Check if player health dropped -> SHATTER EVENT
             if self.player.health <= 0 and not self.shattered:
@@ -189,50 +343,51 @@ class GameEngine:
                 
                 # Generate a single, rare escape portal far from the player
                 self.escape_portals = []
-                portal_x = self.player.pos_x + random.choice([-1, 1]) * random.randint(200, 800)
-                portal_y = SURFACE_Y + random.randint(50, 200)
-                portal_r = random.randint(38, 50)
+                portal_x = self.player.pos_x + self.rng.choice([-1, 1]) * self.rng.randint(200, 800)
+                portal_y = SURFACE_Y + self.rng.randint(50, 200)
+                portal_r = self.rng.randint(38, 50)
                 self.escape_portals.append((portal_x, portal_y, portal_r))
                 self.player.escape_portals = self.escape_portals
                 
         else:
             # Player is in Soul State: Handle Under-realm logic
             # Echoes chase player
-            for echo in self.echoes:
-                echo.update(dt, self.player.pos_x, self.player.pos_y)
+            with prof.section("update.echoes"):
+                if self.echo_swarm is not None:
+                    self.echo_swarm.step(dt, self.player.pos_x)
+                else:
+                    for echo in self.echoes:
+                        echo.update(dt, self.player.pos_x, self.player.pos_y)
             
-            self.bullets.update(dt)
+            with prof.section("update.bullets"):
+                self.projectiles.update(dt)
             
-            # Constantly spawn echoes near escape portals
-            self.echo_spawn_timer += dt
-            if self.echo_spawn_timer > 2.5 and len(self.echoes) < 8:
-                self.echo_spawn_timer = 0.0
-                if self.escape_portals:
-                    # Pick a random portal to guard
-                    px, py, pr = random.choice(self.escape_portals)
-                    spawn_x = px + random.randint(-150, 150)
-                    echo = Echo(spawn_x, SURFACE_Y + 60, "guard")
-                    self.echoes.add(echo)
-                    self.all_sprites.add(echo)
+            with prof.section("spawning"):
+                # Constantly spawn echoes near escape portals
+                self.echo_spawn_timer += dt
+                if self.echo_spawn_timer > 2.5 and len(self.echoes) < 8 and self.streaming.has_room("echoes", len(self.echoes)):
+                    self.echo_spawn_timer = 0.0
+                    if self.escape_portals:
+                        # Pick a random portal to guard
+                        px, py, pr = self.rng.choice(self.escape_portals)
+                        spawn_x = px + self.rng.randint(-150, 150)
+                        echo = self.echo_pool.acquire(spawn_x, SURFACE_Y + 60, "guard", rng=self.rng,
+                                                      swarm=self.echo_swarm)
+                        self.echoes.add(echo)
+                        self.all_sprites.add(echo)
             
-            # Check bullet-echo collisions for harvesting
-            for bullet in self.bullets:
-                hit_echoes = pygame.sprite.spritecollide(bullet, self.echoes, False)
-                for echo in hit_echoes:
-                    echo.take_damage(10)
-                    bullet.kill()
-                    self.vfx.emit_explosion(echo.rect.centerx, echo.rect.centery, NEON_GLOW, 10)
-                    if not echo.alive(): # if it died from this shot
-                        self.player.soul_energy += 10.0 
-                        self.camera.add_shake(10.0, 0.2)
+            with prof.section("collisions"):
+                # Check bullet-echo collisions for harvesting
+                self.projectiles.collide(self.echoes, self._on_bullet_hit_echo)
                         
-            # Check Echo-Player collisions (damage)
-            hit_by_echoes = pygame.sprite.spritecollide(self.player, self.echoes, False)
-            for echo in hit_by_echoes:
-                self.player.soul_energy -= 10.0 # Take damage to limit total resurrections
-                echo.take_damage(100) # kill echo
-                self.camera.add_shake(10.0, 0.2)
-                self.vfx.emit_explosion(self.player.rect.centerx, self.player.rect.centery, GHOST_BLUE, 20)
+                # Check Echo-Player collisions (damage)
+                self.echo_index.rebuild(self.echoes)
+                hit_by_echoes = self.echo_index.query(self.player.rect)
+                for echo in hit_by_echoes:
+                    self.player.soul_energy -= 10.0 # Take damage to limit total resurrections
+                    echo.take_damage(100) # kill echo
+                    self.camera.add_shake(10.0, 0.2)
+                    self.vfx.emit_explosion(self.player.rect.centerx, self.player.rect.centery, GHOST_BLUE, 20)
                 
             # Resurrection triggering -> Break Surface Event
             # 1. Soul energy hit 100
@@ -259,58 +414,205 @@ class GameEngine:
                 self.running = False
 
         # Constantly check for and spawn new Echoes 
-        self._spawn_echoes()
+        with prof.section("spawning"):
+            self._spawn_echoes()
         
+    def _on_bullet_hit_enemy(self, enemy: BaseEnemy):
+        enemy.take_damage(10)
+        self.vfx.emit_explosion(enemy.rect.centerx, enemy.rect.centery, NEON_GLOW, 10)
+
+    def _on_bullet_hit_echo(self, echo: Echo):
+        echo.take_damage(10)
+        self.vfx.emit_explosion(echo.rect.centerx, echo.rect.centery, NEON_GLOW, 10)
+        if not echo.alive(): # if it died from this shot
+            self.player.soul_energy += 10.0 
+            self.camera.add_shake(10.0, 0.2)
+
     def _spawn_echoes(self):
-        """Consume the pending list and spawn Echoes."""
+        """Consume the echo scheduler and spawn Echoes."""
         # Wait until there are less than 5 echoes active across the map
-        while len(self.echoes) < 5 and len(PendingEchoes) > 0:
-            metadata = PendingEchoes.pop(0)
+        while len(self.echoes) < 5 and self.echo_scheduler and self.streaming.has_room("echoes", len(self.echoes)):
+            enemy_type, _, y_spawn = self.echo_scheduler.dequeue()
             # Spawn relative to player, spread out
-            x_spawn = self.player.pos_x + random.randint(-600, 600)
-            echo = Echo(x_spawn, metadata["y_spawn"], metadata["type"])
+            x_spawn = self.player.pos_x + self.rng.randint(-600, 600)
+            echo = self.echo_pool.acquire(x_spawn, y_spawn, enemy_type, rng=self.rng,
+                                          swarm=self.echo_swarm)
             self.echoes.add(echo)
             self.all_sprites.add(echo)
 
-    def draw(self):
+    def pool_stats(self) -> dict:
+        """Recycling statistics for each entity pool."""
+        return {
+            "enemies": self.enemy_pool.stats(),
+            "echoes": self.echo_pool.stats(),
+        }
+
+    def state_digest(self) -> str:
+        """Hash of the simulation state; equal digests mean a replay reproduced its recording."""
+        player = self.player
+        state = [self.level, self.time_survived, self.shattered, player.pos_x, player.pos_y,
+                 player.health, player.soul_energy, player.is_alive, len(self.echo_scheduler)]
+        for group in (self.enemies, self.echoes):
+            state.append(sorted(sprite.rect.topleft for sprite in group))
+        state.append(sorted(self.projectiles.positions()))
+        return hashlib.blake2b(repr(state).encode(), digest_size=8).hexdigest()
+
+    def save_recording(self) -> None:
+        if self.recorder is None:
+            return
+        replay = self.recorder.replay
+        replay.digest = self.state_digest()
+        size = replay.save(self.record_path)
+        print(f"Recorded {len(replay)} frames to {self.record_path} ({size} bytes)")
+
+    def _snapshot_positions(self):
+        """Remembers every sprite's position before a tick, for render interpolation."""
+        for sprite in self.all_sprites:
+            sprite.prev_pos = sprite.rect.topleft
+
+    def _effective_zoom(self) -> float:
+        return self.camera.get_zoom() if self.quality.tier.zoom else 1.0
+
+    def _view_rect(self) -> pygame.Rect:
+        """Region of render_surf that survives the zoom crop, padded by CULL_MARGIN."""
+        zoom = self._effective_zoom()
+        rw, rh = self.render_w, self.render_h
+        if zoom > 1.01:
+            zw = int(rw / zoom)
+            zh = int(rh / zoom)
+            view = pygame.Rect((rw - zw) // 2, (rh - zh) // 2, zw, zh)
+        else:
+            view = pygame.Rect(0, 0, rw, rh)
+        return view.inflate(CULL_MARGIN * 2, CULL_MARGIN * 2)
+
+    def _scaled_image(self, image: pygame.Surface) -> pygame.Surface:
+        """Returns `image` at internal resolution; sprite images are shared, so this stays small."""
+        scaled = self._scaled_images.get(image)
+        if scaled is None:
+            w, h = image.get_size()
+            s = self.render_scale
+            scaled = pygame.transform.scale(image, (max(1, round(w * s)), max(1, round(h * s))))
+            self._scaled_images[image] = scaled
+        return scaled
+
+    def draw(self, alpha: float = 1.0, frame_start: float = None):
+        """
+        Renders the world `alpha` of the way between the previous and current tick.
+        frame_start (perf_counter) is when the frame began, for latency accounting.
+        Pipelined, this presents the previous frame and queues this one.
+        """
+        if frame_start is None:
+            frame_start = time.perf_counter()
+        prof = self.profiler
+        if self.pipeline is not None:
+            self.render_surf = self.pipeline.back_buffer()
+        with prof.section("draw.world"):
+            self._draw_world(alpha)
+        
+        # 3. Draw VFX (Over entities, under UI)
+        cx, cy = self.camera.get_offset(alpha)
+        with prof.section("draw.vfx"):
+            self.vfx.draw(self.render_surf, offset_x=cx, offset_y=cy, scale=self.render_scale,
+                          view=self._view_rect())
+        
+        zoom = self._effective_zoom()
+        if self.pipeline is None:
+            self._post_and_zoom(self.render_surf, self.dt, zoom)
+            self._present(frame_start)
+            return
+        
+        # Pipelined: the worker has been processing earlier frames meanwhile; present
+        # the oldest once the pipeline is full, then queue this one
+        if self.pipeline.in_flight >= self.pipeline.depth:
+            with prof.section("pipeline.wait"):
+                previous_start = self.pipeline.wait()
+            self._present(previous_start)
+        self.pipeline.submit(self.dt, zoom, frame_start)
+
+    def flush_pipeline(self):
+        """Presents every frame still on the render worker."""
+        while self.pipeline is not None and self.pipeline.in_flight:
+            self._present(self.pipeline.wait())
+
+    def shutdown(self):
+        """Presents what the render worker still holds, then stops and joins it. Rendering continues serially."""
+        self.flush_pipeline()
+        if self.pipeline is not None:
+            self.pipeline.close()
+            self.pipeline = None
+
+    def _post_and_zoom(self, source: pygame.Surface, dt: float, zoom: float):
+        """Post-processing, then zoom and upscale into the window surface. Runs on the worker when pipelined."""
+        # Apply Post Processing
+        final_screen = self.post_processor.apply_effects(source, dt)
+        
+        # Apply Zoom and upscale to the window in a single scale pass
+        rw, rh = self.render_w, self.render_h
+        with self.profiler.section("zoom"):
+            if zoom > 1.01 or self.render_scale != 1.0:
+                if zoom > 1.01:
+                    zw = int(rw / zoom)
+                    zh = int(rh / zoom)
+                    final_screen = final_screen.subsurface(((rw - zw) // 2, (rh - zh) // 2, zw, zh))
+                upscale = pygame.transform.smoothscale if self.smooth_upscale else pygame.transform.scale
+                upscale(final_screen, (SCREEN_WIDTH, SCREEN_HEIGHT), self.screen)
+            else:
+                self.screen.blit(final_screen, (0, 0))
+
+    def _present(self, frame_start: float):
+        """HUD, overlay and flip, always on the main thread. The HUD shows the newest simulation state."""
+        prof = self.profiler
+        # 4. GUI (Static, ignores camera offset) - widgets only re-render when their text changes
+        with prof.section("hud"):
+            self._draw_hud()
+        prof.draw_overlay(self.screen)
+
+        with prof.section("flip"):
+            pygame.display.flip()
+        self.frame_latency_ms.append((time.perf_counter() - frame_start) * 1000.0)
+
+    def _draw_world(self, alpha: float):
+        """Backgrounds and sprites into render_surf, at internal resolution."""
         self.render_surf.fill(BLACK)
         
-        # Calculate camera offset from juice
-        cx, cy = self.camera.get_offset()
+        # Calculate camera offset from juice; world coordinates are multiplied by s for render_surf
+        cx, cy = self.camera.get_offset(alpha)
+        s = self.render_scale
+        rw, rh = self.render_w, self.render_h
+        line_w = max(1, round(4 * s))
         
         # 1. Backgrounds - infinite fill based on camera
+        line_y = int((SURFACE_Y + cy) * s)
         if self.player.is_alive:
             # Overworld sky is already black from fill
             # Under-surface dark area extends infinitely
-            under_top = SURFACE_Y + cy
-            if under_top < SCREEN_HEIGHT:
-                surf_rect = pygame.Rect(0, max(0, under_top), SCREEN_WIDTH, SCREEN_HEIGHT)
+            if line_y < rh:
+                surf_rect = pygame.Rect(0, max(0, line_y), rw, rh)
                 pygame.draw.rect(self.render_surf, (10, 15, 30), surf_rect)
             
             # Draw The Glass Divide (infinite line)
-            line_y = SURFACE_Y + cy
-            if 0 <= line_y <= SCREEN_HEIGHT:
-                pygame.draw.line(self.render_surf, NEON_GLOW, (0, line_y), (SCREEN_WIDTH, line_y), 4)
+            if 0 <= line_y <= rh:
+                pygame.draw.line(self.render_surf, NEON_GLOW, (0, line_y), (rw, line_y), line_w)
         else:
             # The Under-realm fills the entire screen
             self.render_surf.fill((5, 10, 20))
             # Draw overworld color above the surface line
-            line_y = SURFACE_Y + cy
             if line_y > 0:
-                over_rect = pygame.Rect(0, 0, SCREEN_WIDTH, min(line_y, SCREEN_HEIGHT))
+                over_rect = pygame.Rect(0, 0, rw, min(line_y, rh))
                 pygame.draw.rect(self.render_surf, (15, 10, 25), over_rect)
             
             
             # The Glass Divide (now drawn continuously as a solid line)
-            pygame.draw.line(self.render_surf, GHOST_BLUE, (0, line_y), (SCREEN_WIDTH, line_y), 4)
+            pygame.draw.line(self.render_surf, GHOST_BLUE, (0, line_y), (rw, line_y), line_w)
             
             # Draw floating bean-shaped/circular portals in the underground
             for px, py, pr in self.escape_portals:
-                screen_px = int(px) + cx
-                screen_py = int(py) + cy
+                screen_px = int((int(px) + cx) * s)
+                screen_py = int((int(py) + cy) * s)
+                pr = max(1, int(pr * s))
                 
                 # Only draw if roughly on screen
-                if -100 <= screen_px <= SCREEN_WIDTH + 100:
+                if -100 * s <= screen_px <= rw + 100 * s:
                     # Outer Glow Aura (Concentric circles)
                     # We can simulate glow easily by drawing a couple of large transparent-ish circles directly
                     # However Pygame basic shapes don't support alpha directly on the destination surface well without SRCALPHA.
@@ -323,71 +625,177 @@ class GameEngine:
                     # Inner Portal (Oval/Bean shape)
                     portal_rect = pygame.Rect(screen_px - pr, screen_py - int(pr*0.8), pr * 2, int(pr*1.6))
                     pygame.draw.ellipse(self.render_surf, (30, 10, 50), portal_rect) # Dark purple void
-                    pygame.draw.ellipse(self.render_surf, NEON_GLOW, portal_rect, 4) # Neon edge
+                    pygame.draw.ellipse(self.render_surf, NEON_GLOW, portal_rect, line_w) # Neon edge
 
-        # 2. Draw Entities
+        # 2. Draw Entities - one batched blit, skipping sprites outside the view
+        view = self._view_rect()
+        native = s == 1.0
+        batch = []
+        culled = 0
         for sprite in self.all_sprites:
-            self.render_surf.blit(sprite.image, (sprite.rect.x + cx, sprite.rect.y + cy))
-            
-        for bullet in self.bullets:
-            self.render_surf.blit(bullet.image, (bullet.rect.x + cx, bullet.rect.y + cy))
-            
-        # 3. Draw VFX (Over entities, under UI)
-        self.vfx.draw(self.render_surf, offset_x=cx, offset_y=cy)
-        
-        # Apply Post Processing
-        final_screen = self.post_processor.apply_effects(self.render_surf, self.dt)
+            x, y = sprite.rect.topleft
+            px, py = getattr(sprite, "prev_pos", (x, y))
+            image = sprite.image if native else self._scaled_image(sprite.image)
+            sx = int((int(px + (x - px) * alpha) + cx) * s)
+            sy = int((int(py + (y - py) * alpha) + cy) * s)
+            if view.left - image.get_width() < sx < view.right and view.top - image.get_height() < sy < view.bottom:
+                batch.append((image, (sx, sy)))
+            else:
+                culled += 1
+        self.render_surf.blits(batch, doreturn=False)
         
-        # Apply Zoom
-        zoom = self.camera.get_zoom()
-        if zoom > 1.01:
-            zw = int(SCREEN_WIDTH / zoom)
-            zh = int(SCREEN_HEIGHT / zoom)
-            zx = (SCREEN_WIDTH - zw) // 2
-            zy = (SCREEN_HEIGHT - zh) // 2
-            cropped = final_screen.subsurface((zx, zy, zw, zh))
-            self.screen.blit(pygame.transform.scale(cropped, (SCREEN_WIDTH, SCREEN_HEIGHT)), (0, 0))
-        else:
-            self.screen.blit(final_screen, (0, 0))
-        
-        # 4. GUI (Static, ignores camera offset)
+        # Bullets: one blits() per color straight from the projectile arrays
+        bullets_drawn = self.projectiles.draw(self.render_surf, cx, cy, scale=s, alpha=alpha, view=view)
+        self.sprites_drawn = len(batch) + bullets_drawn
+        self.sprites_culled = culled + len(self.projectiles) - bullets_drawn
+
+    def _draw_hud(self):
+        hud = self.hud
         if self.player.is_alive:
-            hp_text = self.font.render(f"Health: {self.player.health}", True, SURFACE_COLOR)
-            self.screen.blit(hp_text, (20, 20))
-            
-            level_text = self.font.render(f"Level: {self.level}", True, (255, 215, 0))
-            self.screen.blit(level_text, (SCREEN_WIDTH - 150, 20))
+            hud.set_text("status", f"Health: {self.player.health}", SURFACE_COLOR, (20, 20))
+            hud.set_text("level", f"Level: {self.level}", (255, 215, 0), (SCREEN_WIDTH - 150, 20))
             # Removed controls text from top of screen as requested
+            hud.hide("title")
+            hud.hide("subtitle")
         else:
-            soul_text = self.font.render(f"Soul: {int(self.player.soul_energy)}", True, GHOST_BLUE)
-            self.screen.blit(soul_text, (20, 20))
-            
-            level_text = self.font.render(f"Level: {self.level}", True, (50, 200, 150))
-            self.screen.blit(level_text, (SCREEN_WIDTH - 150, 20))
+            hud.set_text("status", f"Soul: {int(self.player.soul_energy)}", GHOST_BLUE, (20, 20))
+            hud.set_text("level", f"Level: {self.level}", (50, 200, 150), (SCREEN_WIDTH - 150, 20))
             
             # Main underground message
-            escape_font = pygame.font.SysFont(None, 48)
-            escape_text = escape_font.render("ESCAPE THE BENEATH", True, NEON_GLOW)
-            self.screen.blit(escape_text, (SCREEN_WIDTH//2 - escape_text.get_width()//2, 50))
-            
-            sub_text = self.font.render("Gain back your life! Shoot echoes or find a floating portal!", True, (180, 180, 180))
-            self.screen.blit(sub_text, (SCREEN_WIDTH//2 - sub_text.get_width()//2, 90))
-
-        pygame.display.flip()
+            hud.set_text("title", "ESCAPE THE BENEATH", NEON_GLOW, (SCREEN_WIDTH // 2, 50), font="title", center_x=True)
+            hud.set_text("subtitle", "Gain back your life! Shoot echoes or find a floating portal!", (180, 180, 180),
+                         (SCREEN_WIDTH // 2, 90), center_x=True)
+        hud.draw(self.screen)
 
     async def run(self):
+        if self.audio is None:
+            await self.load_assets()
+            self.clock.tick()  # Don't count the loading stage as a frame
+        accumulator = 0.0
         while self.running:
-            dt = self.clock.tick(FPS) / 1000.0 # Delta time in seconds
-            self.handle_events()
-            self.update(dt)
-            self.draw()
+            # Delta time in seconds, clamped so a stall can't launch entities across the map
+            frame_dt = min(self.clock.tick(self.render_fps) / 1000.0, MAX_FRAME_DT)
+            frame_start = time.perf_counter()
+            self.profiler.begin_frame()
+            with self.profiler.section("events"):
+                self.handle_events()
+            
+            # Fixed-step simulation: consume the accumulated time in SIM_DT ticks
+            accumulator += frame_dt
+            steps = 0
+            while accumulator >= SIM_DT and steps < MAX_SIM_STEPS:
+                self._snapshot_positions()
+                self.update(SIM_DT)
+                accumulator -= SIM_DT
+                steps += 1
+            if steps == MAX_SIM_STEPS and accumulator >= SIM_DT:
+                # Too far behind to catch up: drop the backlog instead of spiralling
+                self.dropped_sim_time += accumulator
+                accumulator = 0.0
+            if self.recorder is not None:
+                self.recorder.end_frame(frame_dt, steps)
+            
+            self.dt = frame_dt  # Post-processing animates in real time
+            self.draw(accumulator / SIM_DT, frame_start)
+            self.profiler.end_frame()
+            self.quality.record((time.perf_counter() - frame_start) * 1000.0)
             
             # This is required for pygbag / web / asyncio compatibility
             await asyncio.sleep(0)
             
+        self.shutdown()
+        self.save_recording()
         pygame.quit()
         sys.exit()
 
+    def run_headless(self, frames: int, dt: float = SIM_DT, draw: bool = True) -> dict:
+        """
+        Runs up to `frames` frames as fast as possible with a fixed dt.
+        Update and draw are timed separately so their throughput can be compared.
+        """
+        if self.audio is None:
+            self.load_assets_blocking()
+        if self.recorder is not None:
+            self.recorder.replay.sim_dt = dt
+        update_time = 0.0
+        draw_time = 0.0
+        frame = 0
+        while frame < frames and self.running:
+            start = time.perf_counter()
+            self.profiler.begin_frame()
+            with self.profiler.section("events"):
+                self.handle_events()
+            self.update(dt)
+            if self.recorder is not None:
+                self.recorder.end_frame(dt, 1)
+            mid = time.perf_counter()
+            if draw:
+                self.draw(frame_start=start)
+            self.profiler.end_frame()
+            update_time += mid - start
+            draw_time += time.perf_counter() - mid
+            frame += 1
+        self.flush_pipeline()
+
+        stats = {
+            "frames": frame,
+            "update_fps": frame / update_time if update_time > 0 else 0.0,
+            "draw_fps": frame / draw_time if draw and draw_time > 0 else 0.0,
+            "total_fps": frame / (update_time + draw_time) if update_time + draw_time > 0 else 0.0,
+        }
+        print(f"Simulated {frame} frames: update {stats['update_fps']:.0f} fps, "
+              f"draw {stats['draw_fps']:.0f} fps, total {stats['total_fps']:.0f} fps")
+        self.save_recording()
+        return stats
+
+    def run_replay(self, replay: Replay, draw: bool = True) -> dict:
+        """
+        Plays `replay` back as fast as possible, running each recorded frame's
+        simulation ticks. The engine must have been built with seed=replay.seed
+        and input_source=ReplayInput(replay).
+        """
+        if self.seed != replay.seed:
+            raise ValueError(f"Replay was recorded with seed {replay.seed}, engine has {self.seed}")
+        if self.audio is None:
+            self.load_assets_blocking()
+        update_time = 0.0
+        draw_time = 0.0
+        ticks = 0
+        frame = 0
+        while self.input.remaining > 0 and self.running:
+            start = time.perf_counter()
+            self.profiler.begin_frame()
+            with self.profiler.section("events"):
+                self.handle_events()
+            for _ in range(self.input.frame.steps):
+                self._snapshot_positions()
+                self.update(replay.sim_dt)
+            ticks += self.input.frame.steps
+            mid = time.perf_counter()
+            self.dt = self.input.frame.dt
+            if draw:
+                self.draw(frame_start=start)
+            self.profiler.end_frame()
+            update_time += mid - start
+            draw_time += time.perf_counter() - mid
+            frame += 1
+        self.flush_pipeline()
+
+        total = update_time + draw_time
+        stats = {
+            "frames": frame,
+            "ticks": ticks,
+            "update_fps": frame / update_time if update_time > 0 else 0.0,
+            "draw_fps": frame / draw_time if draw and draw_time > 0 else 0.0,
+            "total_fps": frame / total if total > 0 else 0.0,
+            "digest": self.state_digest(),
+        }
+        stats["matched"] = stats["digest"] == replay.digest
+        print(f"Replayed {frame} frames ({ticks} ticks): update {stats['update_fps']:.0f} fps, "
+              f"draw {stats['draw_fps']:.0f} fps, total {stats['total_fps']:.0f} fps, "
+              f"state {'matches' if stats['matched'] else 'DIVERGED from'} recording")
+        return stats
+
 if __name__ == "__main__":
     engine = GameEngine()
     asyncio.run(engine.run())
@@ -0,0 +1,111 @@
+"""
+PostProcessor steady state: after warm-up, apply_effects must not allocate
+any new Surfaces and must keep writing into the same render targets.
+"""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import pytest
+
+from src.core.post_processing import POST_BACKENDS, PostProcessor
+
+SIZE = (320, 180)
+FRAMES = 30
+TARGETS = ("final_surf", "r_shift", "b_shift", "bloom_surf", "bloom_upscaled")
+
+
+@pytest.fixture(scope="module", autouse=True)
+def display():
+    pygame.display.init()
+    pygame.display.set_mode(SIZE)
+    yield
+    pygame.display.quit()
+
+
+@pytest.fixture
+def surface_count(monkeypatch):
+    """
+    Records every Surface allocated while the test runs: constructed directly,
+    returned by copy/convert/convert_alpha, by transform.scale/smoothscale
+    without a destination, or by image.frombuffer. pygame.Surface is a C type
+    whose methods can't be patched, so it is swapped for a counting subclass
+    and whatever the wrapped calls return is re-homed into that subclass.
+    """
+    created = []
+    base = pygame.Surface
+
+    def adopt(surface):
+        # Same size, flags and pixel format (so the same pitch), then the pixels
+        twin = CountingSurface(surface.get_size(), surface.get_flags(), surface)
+        twin.get_buffer().write(surface.get_buffer().raw)
+        if surface.get_colorkey() is not None:
+            twin.set_colorkey(surface.get_colorkey())
+        return twin
+
+    class CountingSurface(base):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            created.append(self)
+
+        def copy(self):
+            return adopt(base.copy(self))
+
+        def convert(self, *args):
+            return adopt(base.convert(self, *args))
+
+        def convert_alpha(self, *args):
+            return adopt(base.convert_alpha(self, *args))
+
+    def counting(fn):
+        def wrapper(surface, size, dest_surface=None):
+            if dest_surface is not None:
+                return fn(surface, size, dest_surface)
+            return adopt(fn(surface, size))
+        return wrapper
+
+    frombuffer = pygame.image.frombuffer
+    monkeypatch.setattr(pygame, "Surface", CountingSurface)
+    monkeypatch.setattr(pygame.transform, "scale", counting(pygame.transform.scale))
+    monkeypatch.setattr(pygame.transform, "smoothscale", counting(pygame.transform.smoothscale))
+    monkeypatch.setattr(pygame.image, "frombuffer", lambda *args: adopt(frombuffer(*args)))
+    return created
+
+
+def _scene() -> pygame.Surface:
+    scene = pygame.Surface(SIZE).convert()
+    scene.fill((10, 15, 30))
+    pygame.draw.rect(scene, (255, 255, 255), (40, 40, 30, 30))
+    pygame.draw.line(scene, (200, 50, 255), (0, 90), (SIZE[0], 90), 4)
+    return scene
+
+
+@pytest.mark.parametrize("backend", POST_BACKENDS)
+def test_steady_state_allocates_no_surfaces(backend, surface_count):
+    post = PostProcessor(*SIZE, backend=backend, cache_dir=None)
+    scene = _scene()
+    first = post.apply_effects(scene, 1 / 60)  # Warm-up
+    targets = [getattr(post, name) for name in TARGETS]
+
+    constructed = len(surface_count)
+    for _ in range(FRAMES):
+        assert post.apply_effects(scene, 1 / 60) is first
+    assert len(surface_count) == constructed
+    for name, target in zip(TARGETS, targets):
+        assert getattr(post, name) is target, name
+
+
+@pytest.mark.parametrize("backend", POST_BACKENDS)
+def test_resizes_to_the_frame_it_is_given(backend):
+    post = PostProcessor(*SIZE, backend=backend, cache_dir=None)
+    post.apply_effects(_scene(), 1 / 60)
+
+    half = (SIZE[0] // 2, SIZE[1] // 2)
+    scene = pygame.Surface(half).convert()
+    scene.fill((200, 200, 200))
+    out = post.apply_effects(scene, 1 / 60)
+    assert out.get_size() == half
+    assert all(getattr(post, name).get_size() == half for name in TARGETS if name != "bloom_surf")
+    assert all(overlay.get_size() == half for overlay in post._overlays)